@@ -4,6 +4,10 @@ data_structures.py
 Description:
     Basic data structure objects
 """
+# stdlib
+import array
+import bisect
+import itertools
 
 
 class Node(object):
@@ -25,8 +29,9 @@ class Node(object):
         :rtype: n/a
         """
         self.name = name
-        self.parent = parent
         self._children = []
+        self._index_hint = 0
+        self.parent = parent
 
     # --------------------------------------------------------------------------
     # general
@@ -34,14 +39,23 @@ class Node(object):
     @property
     def index(self):
         """
-        Returns this nodes inex relative to its parent
+        Returns this nodes inex relative to its parent.
+        The last known position is cached, so repeated lookups are O(1) until
+        siblings are inserted or removed before this node
 
         :return: int
         :rtype: int
         """
-        if self._parent is not None:
-            return self._parent._children.index(self)
-        return 0
+        parent = self.parent
+        if parent is None:
+            return 0
+        siblings = parent._children
+        hint = self._index_hint
+        if hint < len(siblings) and siblings[hint] is self:
+            return hint
+        hint = siblings.index(self)
+        self._index_hint = hint
+        return hint
 
     @property
     def long_name(self):
@@ -124,6 +138,7 @@ class Node(object):
         :return: n/a
         :rtype: n/a
         """
+        object_._index_hint = len(self._children)
         self._children.append(object_)
 
     def insert(self, index, object_):
@@ -138,6 +153,7 @@ class Node(object):
         :rtype: n/a
         """
         self._children.insert(index, object_)
+        object_._index_hint = index
 
     def remove(self, object_):
         """
@@ -149,7 +165,7 @@ class Node(object):
         :rtype: n/a
         """
         self._children.remove(object_)
-        object_.parent = None
+        object_.__dict__["parent"] = None
 
     def pop(self, index=None):
         """
@@ -163,9 +179,66 @@ class Node(object):
         if index is None:
             index = self.child_count - 1
         object_ = self._children.pop(index)
-        object_.parent = None
+        object_.__dict__["parent"] = None
         return object_
 
+    def _reindex_children(self, start=0):
+        """
+        Refreshes the cached position of this node's children from `start` onwards
+
+        :param start: index of the first child to refresh
+        :type start: int
+        :return: n/a
+        :rtype: n/a
+        """
+        children = self._children
+        for i in range(start, len(children)):
+            children[i]._index_hint = i
+
+    def insert_children(self, index, objects):
+        """
+        Inserts all of the given objects into this object's children list at
+        the given index in a single operation.
+        Objects parented elsewhere are unlinked from their current parent first
+
+        :param index: the index to insert at
+        :type index: int
+        :param objects: the objects to insert
+        :type objects: iterable of <class 'Node'>
+        :return: n/a
+        :rtype: n/a
+        """
+        objects = list(objects)
+        lineage = set(id(each) for each in self.ancestors())
+        lineage.add(id(self))
+        for object_ in objects:
+            if id(object_) in lineage:
+                raise RuntimeError("Hierarchy cycle error !")
+            cur_parent = object_.__dict__.get("parent")
+            if cur_parent is not None:
+                cur_parent.remove(object_)
+            object_.__dict__["parent"] = self
+        self._children[index:index] = objects
+        self._reindex_children(min(index, len(self._children)))
+
+    def remove_children(self, index, count):
+        """
+        Removes `count` children starting at the given index in a single operation
+
+        :param index: index of the first child to remove
+        :type index: int
+        :param count: number of children to remove
+        :type count: int
+        :return: the children that got removed
+        :rtype: list
+        """
+        removed = self._children[index:index + count]
+        del self._children[index:index + count]
+        for object_ in removed:
+            object_.__dict__["parent"] = None
+        self._reindex_children(index)
+        return removed
+
     # --------------------------------------------------------------------------
     # descendants
     # --------------------------------------------------------------------------
@@ -778,3 +851,246 @@ class UnorderedList(object):
 
     def pop(index=None):
         pass
+
+
+class CompactStringList(object):
+    """
+    Memory efficient sequence of strings.
+    Every string is stored in one contiguous text blob, located by an array of
+    offsets, instead of as a separate Python object. Building a list of a
+    million strings is a single join and reading an item is a slice, at the
+    cost of O(n) inserts and deletes - it suits large, mostly read lists.
+    Appended strings are kept as separate chunks of the blob, merged pairwise
+    as they grow like a binary counter, so appends stay cheap even when mixed
+    with reads. The chunks are only joined into one when a splice needs it.
+
+    Public Attributes:
+        attr1:
+    """
+    def __init__(self, items=()):
+        """
+        Constructor method
+
+        :param items: the initial strings - other objects are converted with str()
+        :type items: iterable
+        :return: N/A
+        :rtype: N/A
+        """
+        self._chunks = []
+        self._starts = array.array("q")
+        self._offsets = array.array("q", [0])
+        self.extend(items)
+
+    def _add_chunk(self, text):
+        """
+        Appends the given text to the blob as a new chunk, merging the trailing
+        chunks while the older one is no longer than the newer one
+
+        :param text: the text to append
+        :type text: string
+        :return: N/A
+        :rtype: N/A
+        """
+        if not text:
+            return
+        chunks = self._chunks
+        starts = self._starts
+        starts.append(self._offsets[-1] - len(text))
+        chunks.append(text)
+        while len(chunks) > 1 and len(chunks[-2]) <= len(chunks[-1]):
+            last = chunks.pop()
+            starts.pop()
+            chunks[-1] += last
+
+    def _blob(self):
+        """
+        Joins the chunks into one and returns it
+
+        :return: the whole blob
+        :rtype: string
+        """
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+            self._starts = array.array("q", [0])
+        return self._chunks[0] if self._chunks else ""
+
+    def _splice(self, first, last, items):
+        """
+        Replaces the items in the range [first, last) with the given items
+
+        :param first: the first index to replace
+        :type first: int
+        :param last: the index after the last one to replace
+        :type last: int
+        :param items: the replacement strings
+        :type items: iterable
+        :return: N/A
+        :rtype: N/A
+        """
+        items = [each if isinstance(each, str) else str(each) for each in items]
+        offsets = self._offsets
+
+        # appending - extend the offsets in place and add a chunk
+        if first == last == len(offsets) - 1:
+            offsets.extend(itertools.accumulate(map(len, items), initial=offsets[-1]))
+            offsets.pop(first + 1)
+            self._add_chunk("".join(items))
+            return
+
+        blob = self._blob()
+        start = offsets[first]
+        end = offsets[last]
+        middle = "".join(items)
+        blob = blob[:start] + middle + blob[end:]
+        self._chunks = [blob] if blob else []
+        self._starts = array.array("q", [0] if blob else [])
+
+        # offsets of the new items, then the shifted offsets of the following ones
+        new_offsets = offsets[:first + 1]
+        new_offsets.extend(itertools.accumulate(map(len, items), initial=start))
+        new_offsets.pop(first + 1)
+        delta = len(middle) - (end - start)
+        tail = offsets[last + 1:]
+        if delta:
+            tail = array.array("q", map(delta.__add__, tail))
+        new_offsets.extend(tail)
+        self._offsets = new_offsets
+
+    def _check_index(self, index):
+        """
+        Returns the given index as a positive index, raising if it is out of range
+
+        :param index: the index to check
+        :type index: int
+        :return: the positive index
+        :rtype: int
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("list index out of range")
+        return index
+
+    def __len__(self):
+        """
+        Returns the number of strings in this list
+
+        :return: number of strings
+        :rtype: int
+        """
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        """
+        Returns the string - or list of strings for a slice - at the given index
+
+        :param index: the index or slice to fetch
+        :type index: int, slice
+        :return: the string(s)
+        :rtype: string, list
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = self._check_index(index)
+        start = self._offsets[index]
+        end = self._offsets[index + 1]
+        if start == end:
+            return ""
+        # strings never span chunks
+        chunk = bisect.bisect_right(self._starts, start) - 1
+        base = self._starts[chunk]
+        return self._chunks[chunk][start - base:end - base]
+
+    def __setitem__(self, index, value):
+        """
+        Replaces the string at the given index
+
+        :param index: the index to replace
+        :type index: int
+        :param value: the new string
+        :type value: string
+        :return: N/A
+        :rtype: N/A
+        """
+        index = self._check_index(index)
+        self._splice(index, index + 1, [value])
+
+    def __delitem__(self, index):
+        """
+        Removes the string - or contiguous slice of strings - at the given index
+
+        :param index: the index or slice to remove
+        :type index: int, slice
+        :return: N/A
+        :rtype: N/A
+        """
+        if isinstance(index, slice):
+            first, last, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("only contiguous slices can be deleted")
+            self._splice(first, max(first, last), [])
+            return
+        index = self._check_index(index)
+        self._splice(index, index + 1, [])
+
+    def __iter__(self):
+        """
+        Iterates over the strings in this list
+
+        :return: the strings
+        :rtype: generator
+        """
+        blob = self._blob()
+        offsets = self._offsets
+        for i in range(len(offsets) - 1):
+            yield blob[offsets[i]:offsets[i + 1]]
+
+    def insert(self, index, item):
+        """
+        Inserts the given string before the given index
+
+        :param index: the index to insert at
+        :type index: int
+        :param item: the string to insert
+        :type item: string
+        :return: N/A
+        :rtype: N/A
+        """
+        self.insert_many(index, [item])
+
+    def insert_many(self, index, items):
+        """
+        Inserts all of the given strings before the given index in a single splice
+
+        :param index: the index to insert at
+        :type index: int
+        :param items: the strings to insert
+        :type items: iterable
+        :return: N/A
+        :rtype: N/A
+        """
+        index = min(max(index + len(self) if index < 0 else index, 0), len(self))
+        self._splice(index, index, items)
+
+    def append(self, item):
+        """
+        Adds the given string to the end of this list
+
+        :param item: the string to add
+        :type item: string
+        :return: N/A
+        :rtype: N/A
+        """
+        self._splice(len(self), len(self), [item])
+
+    def extend(self, items):
+        """
+        Adds all of the given strings to the end of this list
+
+        :param items: the strings to add
+        :type items: iterable
+        :return: N/A
+        :rtype: N/A
+        """
+        self._splice(len(self), len(self), items)
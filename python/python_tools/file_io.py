@@ -5,9 +5,69 @@ Description:
     Tools and utilities for operating on files or file like objects
 """
 # stdlib
+import asyncio
+import bz2
+import functools
+import gzip
 import json
+import lzma
+import math
 import os
+import re
 import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+
+# external
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# ==============================================================================
+# constants/globals
+# ==============================================================================
+JSON_CHUNK_SIZE = 1 << 16
+FOLLOW_SIGNATURE_SIZE = 64
+
+ASYNC_MAX_WORKERS = 8
+ASYNC_LINE_BATCH = 1024
+_ASYNC_EXECUTOR = None
+_ASYNC_EXECUTOR_LOCK = threading.Lock()
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_NUMBER_END = re.compile(r"[^0-9eE.+\-]")
+# what may follow a decode error that only means the value was cut short by
+# the end of the buffer: nothing, a partial number or literal, an
+# unterminated string or a partial \uXXXX escape (or surrogate pair)
+_JSON_TRUNCATED_TAIL = re.compile(
+    r'(?:[0-9eE.+\-]*|t(?:r(?:ue?)?)?|f(?:a(?:l(?:se?)?)?)?|n(?:u(?:ll?)?)?|N(?:aN?)?|'
+    r'-?I(?:n(?:f(?:i(?:n(?:i(?:ty?)?)?)?)?)?)?|"(?:[^"\\]|\\.)*\\?|'
+    r'\\?u[0-9a-fA-F]{0,4}(?:\\(?:u[0-9a-fA-F]{0,3})?)?)\Z')
+
+COMPRESS_LEVEL = 6
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "lzma",
+    ".lzma": "lzma",
+    ".zst": "zstd",
+}
+COMPRESSION_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "lzma"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
 
 
 # ==============================================================================
@@ -29,9 +89,87 @@ def get_home_dir():
     return os.path.abspath(home)
 
 
+def get_compression(filepath, mode='r'):
+    """
+    Returns the name of the compression format used by the given file.
+    Existing files being read are identified by their magic bytes, otherwise
+    the format is chosen from the file extension
+
+    :param filepath: full path to the file
+    :type filepath: str
+    :param mode: the mode the file will be opened with
+    :type mode: str
+    :return: one of "gzip", "bz2", "lzma", "zstd" or None for plain files
+    :rtype: str, None
+    """
+    if "r" in mode and os.path.isfile(filepath):
+        with open(filepath, 'rb') as infile:
+            header = infile.read(6)
+        for magic, compression in COMPRESSION_MAGIC:
+            if header.startswith(magic):
+                return compression
+        return None
+
+    extension = os.path.splitext(filepath)[-1].lower()
+    return COMPRESSION_EXTENSIONS.get(extension)
+
+
+def open_file(filepath, mode='r', compresslevel=COMPRESS_LEVEL):
+    """
+    Opens the given file, transparently (de)compressing gzip, bz2, xz/lzma
+    and zstd files. Compressed files are streamed, so memory use stays flat
+    regardless of file size. Text modes are returned for modes without "b"
+
+    :param filepath: full path to the file
+    :type filepath: str
+    :param mode: file mode - one of "r", "w", "a" optionally followed by "b"
+    :type mode: str
+    :param compresslevel: compression level from 0 to 9 used when writing.
+                          Lower values write faster, higher values produce
+                          smaller files
+    :type compresslevel: int
+    :return: file object
+    :rtype: file like object
+    """
+    compression = get_compression(filepath, mode)
+    if compression is None:
+        return open(filepath, mode)
+
+    if "b" not in mode:
+        mode = mode.rstrip("t") + "t"
+    writing = "r" not in mode
+    if writing and (isinstance(compresslevel, bool) or compresslevel not in range(10)):
+        msg = "compresslevel must be an integer from 0 to 9 - got {!r}".format(compresslevel)
+        raise ValueError(msg)
+
+    if compression == "gzip":
+        if writing:
+            return gzip.open(filepath, mode, compresslevel=compresslevel)
+        return gzip.open(filepath, mode)
+
+    if compression == "bz2":
+        if writing:
+            return bz2.open(filepath, mode, compresslevel=max(1, compresslevel))
+        return bz2.open(filepath, mode)
+
+    if compression == "lzma":
+        if writing:
+            return lzma.open(filepath, mode, preset=compresslevel)
+        return lzma.open(filepath, mode)
+
+    if zstandard is None:
+        msg = "Reading/writing zstd files requires the zstandard package: {}".format(filepath)
+        raise ImportError(msg)
+    if writing:
+        cctx = zstandard.ZstdCompressor(level=compresslevel)
+        return zstandard.open(filepath, mode, cctx=cctx)
+    return zstandard.open(filepath, mode)
+
+
 def line_processor(filepath, func, *func_args, **func_kwargs):
     """
-    Runs each line in the given filepath through the specified function
+    Runs each line in the given filepath through the specified function.
+    Compressed files are decompressed on the fly
 
     :param filepath: full path to the file you wish to operate on
     :type filepath: str
@@ -44,8 +182,190 @@ def line_processor(filepath, func, *func_args, **func_kwargs):
     :return: n/a
     :rtype: n/a
     """
-    for line in open(filepath, 'r'):
-        func(line, *args, **kwargs)
+    with open_file(filepath, 'r') as infile:
+        for line in infile:
+            func(line, *func_args, **func_kwargs)
+
+
+# ==============================================================================
+# follow
+# ==============================================================================
+class LineFollower(object):
+    """
+    Tail/follow style line processor for a set of growing files.
+    Remembers the byte offset and inode identity of each file, so that every
+    call to process() only feeds lines appended since the previous call.
+    Rotated files (new inode) and truncated files (size below the stored
+    offset) are re-read from the start. Incomplete trailing lines are held
+    back until their newline has been written.
+
+    Usage:
+        follower = LineFollower(["/var/log/a.log"], state_path="/tmp/follow.json")
+        follower.follow(handle_line)
+
+    Public Attributes:
+        :attr filepaths: full paths of the files being followed
+        :type filepaths: list
+        :attr state_path: optional full path of the file used to persist offsets
+        :type state_path: str, None
+        :attr offsets: per-file {"device", "inode", "offset", "signature"} records
+        :type offsets: dict
+    """
+    def __init__(self, filepaths, state_path=None):
+        """
+        Defines and initializes each instance object
+
+        :param filepaths: full paths of the files to follow
+        :type filepaths: list
+        :param state_path: full path of a json file used to persist offsets
+                           across restarts. If None, offsets are kept in memory
+        :type state_path: str, None
+        :return: n/a
+        :rtype: n/a
+        """
+        if isinstance(filepaths, str):
+            filepaths = [filepaths]
+        self.filepaths = [os.path.abspath(each) for each in filepaths]
+        self.state_path = state_path
+        self.offsets = {}
+        self.load_state()
+
+    # --------------------------------------------------------------------------
+    # state
+    # --------------------------------------------------------------------------
+    def load_state(self):
+        """
+        Loads previously persisted offsets from the state file, if any
+
+        :return: n/a
+        :rtype: n/a
+        """
+        if not self.state_path or not os.path.isfile(self.state_path):
+            return
+        with open(self.state_path, 'r') as infile:
+            try:
+                self.offsets = json.load(infile)
+            except ValueError:
+                self.offsets = {}
+
+    def save_state(self):
+        """
+        Atomically writes the current offsets to the state file
+
+        :return: n/a
+        :rtype: n/a
+        """
+        if not self.state_path:
+            return
+        tmp_path = "{}.tmp".format(self.state_path)
+        with open(tmp_path, 'w') as outfile:
+            json.dump(self.offsets, outfile, indent=4)
+        os.replace(tmp_path, self.state_path)
+
+    # --------------------------------------------------------------------------
+    # processing
+    # --------------------------------------------------------------------------
+    def _process_file(self, filepath, func, func_args, func_kwargs):
+        """
+        Feeds any new complete lines of the given file to the specified function
+
+        :param filepath: full path to the file
+        :type filepath: str
+        :param func: callable object used to process each line
+        :type func: any callable
+        :param func_args: miscellaneous positional parameters to the callable
+        :type func_args: tuple
+        :param func_kwargs: miscellaneous keyword parameters to the callable
+        :type func_kwargs: dict
+        :return: number of lines processed
+        :rtype: int
+        """
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            # missing - possibly mid rotation
+            return 0
+
+        record = self.offsets.get(filepath)
+        count = 0
+        with open(filepath, 'rb') as infile:
+            head = infile.read(FOLLOW_SIGNATURE_SIZE)
+            offset = 0
+            if record and record["device"] == stat.st_dev and record["inode"] == stat.st_ino:
+                offset = record["offset"]
+                size = min(offset, FOLLOW_SIGNATURE_SIZE)
+                if stat.st_size < offset or zlib.crc32(head[:size]) != record.get("signature"):
+                    # truncated or replaced
+                    offset = 0
+
+            infile.seek(offset)
+            try:
+                for line in infile:
+                    if not line.endswith(b"\n"):
+                        # incomplete line - wait for the rest of it
+                        break
+                    func(line.decode("utf-8", "replace"), *func_args, **func_kwargs)
+                    offset += len(line)
+                    count += 1
+            finally:
+                # record progress even if func raised, so the lines it already
+                # handled are not replayed - the failing line is retried
+                self.offsets[filepath] = {
+                    "device": stat.st_dev,
+                    "inode": stat.st_ino,
+                    "offset": offset,
+                    "signature": zlib.crc32(head[:min(offset, FOLLOW_SIGNATURE_SIZE)])}
+        return count
+
+    def process(self, func, *func_args, **func_kwargs):
+        """
+        Runs every line appended to the followed files since the last call
+        through the specified function, then persists the new offsets
+
+        :param func: callable object used to process each line
+        :type func: any callable
+        :param *func_args: miscellaneous positional parameters to the callable
+        :type *func_args: tuple
+        :param **func_kwargs: miscellaneous keywork parameters to the callable
+        :type **func_kwargs: dict
+        :return: number of lines processed
+        :rtype: int
+        """
+        count = 0
+        try:
+            for filepath in self.filepaths:
+                count += self._process_file(filepath, func, func_args, func_kwargs)
+        finally:
+            self.save_state()
+        return count
+
+    def follow(self, func, *func_args, interval=2.0, iterations=None, **func_kwargs):
+        """
+        Repeatedly calls process() every `interval` seconds.
+        `interval` and `iterations` are keyword-only, so positional arguments
+        are always passed through to the callable
+
+        :param func: callable object used to process each line
+        :type func: any callable
+        :param *func_args: miscellaneous positional parameters to the callable
+        :type *func_args: tuple
+        :param interval: number of seconds to wait between polls
+        :type interval: float
+        :param iterations: number of polls to run. If None, polls forever
+        :type iterations: int, None
+        :param **func_kwargs: miscellaneous keywork parameters to the callable
+        :type **func_kwargs: dict
+        :return: total number of lines processed
+        :rtype: int
+        """
+        count = 0
+        polls = 0
+        while iterations is None or polls < iterations:
+            if polls:
+                time.sleep(interval)
+            count += self.process(func, *func_args, **func_kwargs)
+            polls += 1
+        return count
 
 
 # ==============================================================================
@@ -53,7 +373,8 @@ def line_processor(filepath, func, *func_args, **func_kwargs):
 # ==============================================================================
 def are_equal(file_a, file_b):
     """
-    Compares 2 files to see if their contents are the same
+    Compares 2 files to see if their contents are the same.
+    Compressed files are compared by their decompressed contents
 
     :param file_a: full path to the first file
     :type file_a: str
@@ -62,8 +383,8 @@ def are_equal(file_a, file_b):
     :return: if the 2 files match
     :rtype: bool
     """
-    for a_line in open(file_a, 'r'):
-        for b_line in open(file_b, 'r'):
+    with open_file(file_a, 'r') as infile_a, open_file(file_b, 'r') as infile_b:
+        for a_line, b_line in zip_longest(infile_a, infile_b):
             if a_line != b_line:
                 return False
     return True
@@ -72,9 +393,10 @@ def are_equal(file_a, file_b):
 # ==============================================================================
 # json
 # ==============================================================================
-def write_json(filepath, data, overwrite=False):
+def write_json(filepath, data, overwrite=False, compresslevel=COMPRESS_LEVEL):
     """
-    Writes or appends the given data to the specified filepath
+    Writes or appends the given data to the specified filepath.
+    Compressed .json files are supported - see open_file
 
     :param filepath: full path to the .json file
     :type filepath: str        
@@ -82,17 +404,469 @@ def write_json(filepath, data, overwrite=False):
     :type data: dict
     :param overwrite: option to overwrite existing data
     :type overwrite: bool
+    :param compresslevel: compression level used for compressed files
+    :type compresslevel: int
     :return: The full path name of the json file
     :rtype: str
     """
     # merge data - if necessary
     if not overwrite and os.path.isfile(filepath):
-        with open(filepath, 'r') as infile:
+        with open_file(filepath, 'r') as infile:
             current_data = json.load(infile)
             data.update(current_data)
 
     # write file
-    with open(filepath, 'w') as outfile:
+    with open_file(filepath, 'w', compresslevel) as outfile:
         json.dump(data, outfile, indent=4)
 
     return filepath
+
+
+def _has_non_finite(data):
+    """
+    Returns if the given data contains a NaN or infinite float anywhere
+
+    :param data: the data to inspect
+    :type data: any json serializable object
+    :return: if a non-finite float was found
+    :rtype: bool
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def _dumps_json(data):
+    """
+    Serializes the given data to a compact json string, using orjson when it
+    is installed and the standard library json module otherwise
+
+    :param data: the data to serialize
+    :type data: any json serializable object
+    :return: json string
+    :rtype: str
+    """
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(data)
+        except TypeError:
+            # orjson is stricter about key types - fall back to json
+            encoded = None
+        # orjson silently writes NaN/Infinity as null - only look for them
+        # when its output contains a null they could have produced
+        if encoded is not None and (b"null" not in encoded or not _has_non_finite(data)):
+            return encoded.decode("utf-8")
+    return json.dumps(data, separators=(",", ":"))
+
+
+class _JsonStream(object):
+    """
+    Buffered character stream used to incrementally decode json values
+    from a file object without reading the whole file into memory
+    """
+    def __init__(self, fileobj, chunk_size=JSON_CHUNK_SIZE):
+        """
+        Defines and initializes each instance object
+
+        :param fileobj: text mode file object to read from
+        :type fileobj: file like object
+        :param chunk_size: number of characters to read per chunk
+        :type chunk_size: int
+        :return: n/a
+        :rtype: n/a
+        """
+        self._fileobj = fileobj
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """
+        Reads the next chunk into the buffer, discarding consumed characters
+
+        :return: if any new data was read
+        :rtype: bool
+        """
+        if self._eof:
+            return False
+        chunk = self._fileobj.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """
+        Skips whitespace and returns the next character without consuming it
+
+        :return: the next non whitespace character or an empty string at eof
+        :rtype: str
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _JSON_WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars):
+        """
+        Consumes the next non whitespace character, which must be one of `chars`
+
+        :param chars: the accepted characters
+        :type chars: str
+        :return: the consumed character
+        :rtype: str
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            msg = "Malformed json: expected one of {!r} - got {!r}".format(chars, char)
+            raise ValueError(msg)
+        self._pos += 1
+        return char
+
+    def value(self):
+        """
+        Decodes and consumes the next json value
+
+        :return: the decoded value
+        :rtype: any
+        """
+        # numbers may continue past the end of the buffer - read until terminated
+        if self.peek() in "-0123456789":
+            while not _JSON_NUMBER_END.search(self._buffer, self._pos) and self._fill():
+                pass
+
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self._buffer, self._pos)
+            except ValueError as error:
+                # malformed data before the end of the buffer can never be
+                # fixed by reading more - fail now instead of retrying on
+                # every chunk until eof
+                position = getattr(error, "pos", None)
+                if position is not None and not _JSON_TRUNCATED_TAIL.match(self._buffer, position):
+                    raise
+                # the value is incomplete - read at least as much again as is
+                # buffered before retrying, so long values decode in linear time
+                pending = len(self._buffer) - self._pos
+                if not self._fill():
+                    raise
+                while len(self._buffer) - self._pos < 2 * pending and self._fill():
+                    pass
+                continue
+            self._pos = end
+            return value
+
+
+def iter_json(filepath, chunk_size=JSON_CHUNK_SIZE):
+    """
+    Incrementally iterates over the top level container of the given json file.
+    Yields (key, value) pairs for objects and items for arrays, so that only
+    one top level entry is held in memory at a time. Compressed files are
+    decompressed on the fly
+
+    :param filepath: full path to the .json file
+    :type filepath: str
+    :param chunk_size: number of characters to read from disk at a time
+    :type chunk_size: int
+    :return: top level (key, value) pairs or array items
+    :rtype: generator
+    """
+    with open_file(filepath, 'r') as infile:
+        stream = _JsonStream(infile, chunk_size)
+        opener = stream.expect("{[")
+        closer = "}" if opener == "{" else "]"
+        if stream.peek() == closer:
+            return
+
+        while True:
+            if opener == "{":
+                key = stream.value()
+                stream.expect(":")
+                yield key, stream.value()
+            else:
+                yield stream.value()
+            if stream.expect("," + closer) == closer:
+                return
+
+
+def iter_json_keys(filepath, chunk_size=JSON_CHUNK_SIZE):
+    """
+    Incrementally iterates over the top level keys of the given json object file
+
+    :param filepath: full path to the .json file
+    :type filepath: str
+    :param chunk_size: number of characters to read from disk at a time
+    :type chunk_size: int
+    :return: top level keys
+    :rtype: generator
+    """
+    for key, _ in iter_json(filepath, chunk_size):
+        yield key
+
+
+class JsonWriter(object):
+    """
+    Incremental json writer that emits a top level object or array one entry
+    at a time, without building the full document in memory.
+
+    Usage:
+        with JsonWriter("/tmp/data.json") as writer:
+            for key, value in source:
+                writer.write(key, value)
+
+    Public Attributes:
+        :attr filepath: full path to the .json file being written
+        :type filepath: str
+        :attr count: number of entries written so far
+        :type count: int
+    """
+    def __init__(self, filepath, array=False, compresslevel=COMPRESS_LEVEL):
+        """
+        Defines and initializes each instance object
+
+        :param filepath: full path to the .json file
+        :type filepath: str
+        :param array: option to write a top level array instead of an object
+        :type array: bool
+        :param compresslevel: compression level used for compressed files
+        :type compresslevel: int
+        :return: n/a
+        :rtype: n/a
+        """
+        self.filepath = filepath
+        self.count = 0
+        self._array = array
+        self._outfile = open_file(filepath, 'w', compresslevel)
+        self._outfile.write("[" if array else "{")
+
+    def _separate(self):
+        """
+        Writes the separator that precedes the next entry
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self._outfile.write(",\n" if self.count else "\n")
+        self.count += 1
+
+    def write(self, key, value):
+        """
+        Writes a single key/value pair to the top level object
+
+        :param key: the entry's key
+        :type key: str
+        :param value: the entry's value
+        :type value: any json serializable object
+        :return: n/a
+        :rtype: n/a
+        """
+        if self._array:
+            raise TypeError("Cannot write key/value pairs to a json array")
+        self._separate()
+        self._outfile.write(json.dumps(str(key)))
+        self._outfile.write(":")
+        self._outfile.write(_dumps_json(value))
+
+    def append(self, item):
+        """
+        Writes a single item to the top level array
+
+        :param item: the item to add
+        :type item: any json serializable object
+        :return: n/a
+        :rtype: n/a
+        """
+        if not self._array:
+            raise TypeError("Cannot append items to a json object")
+        self._separate()
+        self._outfile.write(_dumps_json(item))
+
+    def close(self):
+        """
+        Closes the top level container and the underlying file
+
+        :return: n/a
+        :rtype: n/a
+        """
+        if self._outfile.closed:
+            return
+        self._outfile.write("\n]" if self._array else "\n}")
+        self._outfile.write("\n")
+        self._outfile.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# ==============================================================================
+# async
+# ==============================================================================
+def get_async_executor():
+    """
+    Returns the bounded thread pool used by the async file_io functions.
+    At most ASYNC_MAX_WORKERS blocking file operations run at a time
+
+    :return: the shared thread pool
+    :rtype: instance of <class 'ThreadPoolExecutor'>
+    """
+    global _ASYNC_EXECUTOR
+    with _ASYNC_EXECUTOR_LOCK:
+        if _ASYNC_EXECUTOR is None:
+            _ASYNC_EXECUTOR = ThreadPoolExecutor(
+                max_workers=ASYNC_MAX_WORKERS, thread_name_prefix="file_io")
+        return _ASYNC_EXECUTOR
+
+
+def set_async_workers(count):
+    """
+    Replaces the shared async thread pool with one limited to `count` workers.
+    Work already submitted to the previous pool is allowed to finish
+
+    :param count: maximum number of concurrent blocking file operations
+    :type count: int
+    :return: n/a
+    :rtype: n/a
+    """
+    global _ASYNC_EXECUTOR, ASYNC_MAX_WORKERS
+    if count < 1:
+        raise ValueError("Worker count must be at least 1 - got {}".format(count))
+    with _ASYNC_EXECUTOR_LOCK:
+        previous = _ASYNC_EXECUTOR
+        ASYNC_MAX_WORKERS = count
+        _ASYNC_EXECUTOR = None
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+async def _run_blocking(func, *func_args, **func_kwargs):
+    """
+    Runs the given blocking callable on the shared thread pool
+
+    :param func: the blocking callable
+    :type func: any callable
+    :param *func_args: miscellaneous positional parameters to the callable
+    :type *func_args: tuple
+    :param **func_kwargs: miscellaneous keyword parameters to the callable
+    :type **func_kwargs: dict
+    :return: the callable's return value
+    :rtype: any
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *func_args, **func_kwargs)
+    return await loop.run_in_executor(get_async_executor(), call)
+
+
+async def aline_processor(filepath, func, *func_args, **func_kwargs):
+    """
+    Async counterpart of line_processor. The file is read, and `func` is called,
+    on the shared thread pool so the event loop is never blocked
+
+    :param filepath: full path to the file you wish to operate on
+    :type filepath: str
+    :param func: callable object used to process each line
+    :type func: any callable
+    :param *func_args: miscellaneous positional parameters to the callable
+    :type *func_args: tuple
+    :param **func_kwargs: miscellaneous keywork parameters to the callable
+    :type **func_kwargs: dict
+    :return: n/a
+    :rtype: n/a
+    """
+    await _run_blocking(line_processor, filepath, func, *func_args, **func_kwargs)
+
+
+async def aare_equal(file_a, file_b):
+    """
+    Async counterpart of are_equal
+
+    :param file_a: full path to the first file
+    :type file_a: str
+    :param file_b: The file to check against
+    :type file_b: str
+    :return: if the 2 files match
+    :rtype: bool
+    """
+    return await _run_blocking(are_equal, file_a, file_b)
+
+
+async def awrite_json(filepath, data, overwrite=False, compresslevel=COMPRESS_LEVEL):
+    """
+    Async counterpart of write_json
+
+    :param filepath: full path to the .json file
+    :type filepath: str
+    :param data: the data to add
+    :type data: dict
+    :param overwrite: option to overwrite existing data
+    :type overwrite: bool
+    :param compresslevel: compression level used for compressed files
+    :type compresslevel: int
+    :return: The full path name of the json file
+    :rtype: str
+    """
+    return await _run_blocking(write_json, filepath, data, overwrite, compresslevel)
+
+
+def _read_lines(infile, count):
+    """
+    Reads up to `count` lines from the given file object
+
+    :param infile: the file object to read from
+    :type infile: file like object
+    :param count: maximum number of lines to read
+    :type count: int
+    :return: the lines read - empty at eof
+    :rtype: list
+    """
+    lines = []
+    for line in infile:
+        lines.append(line)
+        if len(lines) >= count:
+            break
+    return lines
+
+
+async def aiter_lines(filepath, batch_size=ASYNC_LINE_BATCH):
+    """
+    Asynchronously iterates over the lines of the given file. Lines are read
+    in batches on the shared thread pool, so many files can be consumed
+    concurrently without stalling other coroutines.
+
+    Usage:
+        async for line in aiter_lines("/var/log/app.log.gz"):
+            ...
+
+    :param filepath: full path to the file you wish to read
+    :type filepath: str
+    :param batch_size: number of lines read per thread pool round trip
+    :type batch_size: int
+    :return: the file's lines
+    :rtype: async generator
+    """
+    infile = await _run_blocking(open_file, filepath, 'r')
+    try:
+        while True:
+            lines = await _run_blocking(_read_lines, infile, batch_size)
+            if not lines:
+                break
+            for line in lines:
+                yield line
+    finally:
+        await _run_blocking(infile.close)
@@ -5,20 +5,45 @@ Description:
    Python Qt objects and utilities
 """
 # stdlib
+import array
+import collections
+import contextlib
+import csv
+import io
+import itertools
+import json
+import sqlite3
 import sys
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 # external
 from PyQt5 import QtCore, QtGui, QtWidgets
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 # internal
 import python_tools.arithmetic as arithmetic
-from python_tools.data_structures import Node
+from python_tools.data_structures import CompactStringList, Node
 
 
 # ==============================================================================
 # constants/globals
 # ==============================================================================
 Q_OBJ_TYPE = type(QtCore.QObject)
+FETCH_PAGE_SIZE = 256
+INDEX_CHUNK_SIZE = 2000
+TABLE_PAGE_SIZE = 512
+TABLE_CACHE_PAGES = 32
+TABLE_READ_AHEAD = 2
+SOURCE_INDEX_STRIDE = 1024
+LOAD_BATCH_SIZE = 1000
+LOAD_INTERVAL = 50
+LOAD_MAX_PENDING = 4
 
 
 # =============================================================================
@@ -111,19 +136,438 @@ class Singleton_Ui_Meta(Q_OBJ_TYPE, type):
         return cls._instance
 
 
+# ==============================================================================
+# paged table sources
+# ==============================================================================
+class TableSource(object):
+    """
+    Base class for the row sources read by PagedTableModel.
+    Sources must support random access to contiguous runs of rows.
+    They are not thread safe - PagedTableModel serializes all reads.
+
+    Public Attributes:
+        :attr headers: the column headers
+        :type headers: list
+    """
+    headers = ()
+
+    def row_count(self):
+        """
+        Returns the number of rows in this source
+
+        :return: number of rows
+        :rtype: int
+        """
+        raise NotImplementedError()
+
+    def read(self, first, count):
+        """
+        Returns up to `count` rows starting at row `first`
+
+        :param first: the first row to read
+        :type first: int
+        :param count: the number of rows to read
+        :type count: int
+        :return: the rows as tuples ordered like `headers`
+        :rtype: list
+        """
+        raise NotImplementedError()
+
+    def reload(self):
+        """
+        Picks up changes made to the underlying data since it was opened
+
+        :return: n/a
+        :rtype: n/a
+        """
+        pass
+
+    def close(self):
+        """
+        Releases any resources held by this source
+
+        :return: n/a
+        :rtype: n/a
+        """
+        pass
+
+
+class _LineIndexedSource(TableSource):
+    """
+    Base class for text sources with one record per line (or per run of
+    lines). A sparse index holds the byte offset of every `index_stride`th
+    record, so memory stays constant per record whatever the file size and
+    any row is reached by one seek plus at most `index_stride` skipped records.
+    """
+    def __init__(self, filepath, encoding="utf-8", index_stride=SOURCE_INDEX_STRIDE):
+        """
+        Defines and initializes each instance object
+
+        :param filepath: the file to read
+        :type filepath: string
+        :param encoding: the file's text encoding
+        :type encoding: string
+        :param index_stride: number of records between indexed offsets
+        :type index_stride: int
+        :return: n/a
+        :rtype: n/a
+        """
+        self.filepath = filepath
+        self.encoding = encoding
+        self.index_stride = index_stride
+        self._handle = open(filepath, "rb")
+        self._offsets = array.array("q")
+        self._count = 0
+        self.reload()
+
+    def _is_complete(self, record):
+        """
+        Returns if the given raw record is complete or continues on the next line
+
+        :param record: the raw record
+        :type record: bytes
+        :return: if the record is complete
+        :rtype: bool
+        """
+        return True
+
+    def _iter_records(self):
+        """
+        Yields the byte offset and raw bytes of each non blank record from
+        the current position of the file handle
+
+        :return: (offset, record) pairs
+        :rtype: generator
+        """
+        handle = self._handle
+        offset = handle.tell()
+        record = b""
+        start = offset
+        for line in iter(handle.readline, b""):
+            offset += len(line)
+            record += line
+            if not self._is_complete(record):
+                continue
+            if record.strip():
+                yield start, record
+            record = b""
+            start = offset
+        if record.strip():
+            yield start, record
+
+    def _start(self):
+        """
+        Positions the file handle on the first data record and returns any
+        records that precede it (e.g. a header)
+
+        :return: the records preceding the data
+        :rtype: list
+        """
+        self._handle.seek(0)
+        return []
+
+    def reload(self):
+        """
+        Rebuilds the sparse record index
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self._handle.seek(0)
+        self._start()
+        offsets = array.array("q")
+        count = 0
+        stride = self.index_stride
+        for offset, _ in self._iter_records():
+            if not count % stride:
+                offsets.append(offset)
+            count += 1
+        self._offsets = offsets
+        self._count = count
+
+    def row_count(self):
+        """
+        Returns the number of records in this source
+
+        :return: number of records
+        :rtype: int
+        """
+        return self._count
+
+    def _parse(self, records):
+        """
+        Converts raw records into row tuples
+
+        :param records: the raw records
+        :type records: list of bytes
+        :return: the rows
+        :rtype: list of tuple
+        """
+        raise NotImplementedError()
+
+    def read(self, first, count):
+        """
+        Returns up to `count` records starting at record `first`
+
+        :param first: the first record to read
+        :type first: int
+        :param count: the number of records to read
+        :type count: int
+        :return: the rows
+        :rtype: list of tuple
+        """
+        if first >= self._count or count <= 0:
+            return []
+        block = first // self.index_stride
+        self._handle.seek(self._offsets[block])
+        skip = first - block * self.index_stride
+        records = itertools.islice(self._iter_records(), skip, skip + count)
+        return self._parse([record for _, record in records])
+
+    def close(self):
+        """
+        Closes the underlying file
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self._handle.close()
+
+
+class CsvTableSource(_LineIndexedSource):
+    """
+    Paged row source reading a CSV file. Quoted fields may span lines.
+    """
+    def __init__(self, filepath, has_header=True, encoding="utf-8", index_stride=SOURCE_INDEX_STRIDE, **fmtparams):
+        """
+        Defines and initializes each instance object
+
+        :param filepath: the csv file to read
+        :type filepath: string
+        :param has_header: if the first record holds the column headers
+        :type has_header: bool
+        :param encoding: the file's text encoding
+        :type encoding: string
+        :param index_stride: number of records between indexed offsets
+        :type index_stride: int
+        :param fmtparams: formatting parameters forwarded to csv.reader
+        :type fmtparams: keyword arguments
+        :return: n/a
+        :rtype: n/a
+        """
+        self.has_header = has_header
+        self.fmtparams = fmtparams
+        self.headers = []
+        super(CsvTableSource, self).__init__(filepath, encoding, index_stride)
+
+    def _is_complete(self, record):
+        """
+        Returns if the given raw record has no unterminated quoted field
+
+        :param record: the raw record
+        :type record: bytes
+        :return: if the record is complete
+        :rtype: bool
+        """
+        return not record.count(b'"') % 2
+
+    def _start(self):
+        """
+        Positions the file handle on the first data record and reads the headers
+
+        :return: the header record - if any
+        :rtype: list
+        """
+        self._handle.seek(0)
+        if not self.has_header:
+            return []
+        header = next(self._iter_records(), None)
+        if header is None:
+            return []
+        self._handle.seek(header[0] + len(header[1]))
+        self.headers = list(self._parse([header[1]])[0])
+        return [header[1]]
+
+    def reload(self):
+        """
+        Rebuilds the sparse record index and column headers
+
+        :return: n/a
+        :rtype: n/a
+        """
+        super(CsvTableSource, self).reload()
+        if not self.has_header and self._count:
+            width = len(self.read(0, 1)[0])
+            self.headers = ["Column{}".format(i) for i in range(width)]
+
+    def _parse(self, records):
+        """
+        Converts raw csv records into row tuples
+
+        :param records: the raw records
+        :type records: list of bytes
+        :return: the rows
+        :rtype: list of tuple
+        """
+        text = b"".join(records).decode(self.encoding)
+        return [tuple(row) for row in csv.reader(io.StringIO(text, newline=""), **self.fmtparams)]
+
+
+class JsonLinesTableSource(_LineIndexedSource):
+    """
+    Paged row source reading a JSON-lines file of objects. Nested values are
+    displayed as json text.
+    """
+    def __init__(self, filepath, headers=None, encoding="utf-8", index_stride=SOURCE_INDEX_STRIDE):
+        """
+        Defines and initializes each instance object
+
+        :param filepath: the json-lines file to read
+        :type filepath: string
+        :param headers: the object keys to show - defaults to the keys of the first object
+        :type headers: list
+        :param encoding: the file's text encoding
+        :type encoding: string
+        :param index_stride: number of records between indexed offsets
+        :type index_stride: int
+        :return: n/a
+        :rtype: n/a
+        """
+        self.headers = list(headers or [])
+        super(JsonLinesTableSource, self).__init__(filepath, encoding, index_stride)
+        if not self.headers and self._count:
+            self._handle.seek(self._offsets[0])
+            first = next(self._iter_records())[1]
+            self.headers = list(json.loads(first.decode(encoding)))
+
+    def _parse(self, records):
+        """
+        Converts raw json records into row tuples
+
+        :param records: the raw records
+        :type records: list of bytes
+        :return: the rows
+        :rtype: list of tuple
+        """
+        rows = []
+        headers = self.headers
+        for record in records:
+            item = json.loads(record.decode(self.encoding))
+            if not isinstance(item, dict):
+                rows.append((item,))
+                continue
+            row = []
+            for header in headers:
+                value = item.get(header)
+                if isinstance(value, (dict, list)):
+                    value = json.dumps(value)
+                row.append(value)
+            rows.append(tuple(row))
+        return rows
+
+
+class SqliteTableSource(TableSource):
+    """
+    Paged row source reading a SQLite table in rowid order.
+    Sequential pages are read with keyset pagination - "rowid > last" - so
+    scrolling does not pay for ever larger OFFSET scans.
+    """
+    def __init__(self, filepath, table, columns=None):
+        """
+        Defines and initializes each instance object
+
+        :param filepath: the database file
+        :type filepath: string
+        :param table: the table to read
+        :type table: string
+        :param columns: the columns to show - defaults to every column
+        :type columns: list
+        :return: n/a
+        :rtype: n/a
+        """
+        self.filepath = filepath
+        self.table = table
+        self._connection = sqlite3.connect(filepath, check_same_thread=False)
+        quote = lambda name: '"{}"'.format(name.replace('"', '""'))
+        selection = ", ".join(quote(each) for each in columns) if columns else "*"
+        self._select = "SELECT rowid, {} FROM {}".format(selection, quote(table))
+        self._count_query = "SELECT COUNT(*) FROM {}".format(quote(table))
+        cursor = self._connection.execute(self._select + " LIMIT 0")
+        self.headers = [each[0] for each in cursor.description[1:]]
+        self._keys = {}
+        self._count = 0
+        self.reload()
+
+    def reload(self):
+        """
+        Recounts the table's rows and forgets the pagination keys
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self._keys = {}
+        self._count = self._connection.execute(self._count_query).fetchone()[0]
+
+    def row_count(self):
+        """
+        Returns the number of rows in the table
+
+        :return: number of rows
+        :rtype: int
+        """
+        return self._count
+
+    def read(self, first, count):
+        """
+        Returns up to `count` rows starting at row `first`
+
+        :param first: the first row to read
+        :type first: int
+        :param count: the number of rows to read
+        :type count: int
+        :return: the rows
+        :rtype: list of tuple
+        """
+        key = self._keys.get(first)
+        if key is not None:
+            query = self._select + " WHERE rowid > ? ORDER BY rowid LIMIT ?"
+            rows = self._connection.execute(query, (key, count)).fetchall()
+        else:
+            query = self._select + " ORDER BY rowid LIMIT ? OFFSET ?"
+            rows = self._connection.execute(query, (count, first)).fetchall()
+        if rows:
+            self._keys[first + len(rows)] = rows[-1][0]
+        return [row[1:] for row in rows]
+
+    def close(self):
+        """
+        Closes the database connection
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self._connection.close()
+
+
 # ==============================================================================
 # model/view objects
 # ==============================================================================
 class ListModel(QtCore.QAbstractListModel):
     """
     Generic list model object for the Python Qt Model/View architecture.
-    The data block for this model is a list
+    The data block for this model is a list - or, when the model is created
+    with `compact=True`, a CompactStringList which stores large lists of
+    strings in a fraction of the memory and loads them with a single join.
 
     Public Attributes:
         :attr block: list of objects that defines this model's internal data block
         :type block: list
+        :attr editable: if views may edit, insert and remove items
+        :type editable: bool
+        :attr compact: if items are stored as a CompactStringList
+        :type compact: bool
     """
-    def _init__(self, parent=None):
+    def __init__(self, block=None, editable=False, compact=False, parent=None):
         """
         Defines and initializes each instance object
 
@@ -131,13 +575,17 @@ class ListModel(QtCore.QAbstractListModel):
         :type block: list, tuple
         :param editable: this models editable state
         :type editable: bool
+        :param compact: store items as a CompactStringList
+        :type compact: bool
         :param parent: this widget's parent
         :type parent: instance of <class 'QObject'>
         :return: n/a
         :rtype: n/a
         """
         super(ListModel, self).__init__(parent)
-        self.block = []
+        self.editable = editable
+        self.compact = compact
+        self.__dict__["block"] = self._make_block(block or [])
 
     # --------------------------------------------------------------------------
     # managed attributes
@@ -148,7 +596,7 @@ class ListModel(QtCore.QAbstractListModel):
         Returns the list of objects that defines this model's internal data block
 
         :return: list of objects that defines this model's internal data block
-        :rtype: list
+        :rtype: list or instance of <class 'CompactStringList'>
         """
         return self.__dict__.get("block")
 
@@ -162,34 +610,111 @@ class ListModel(QtCore.QAbstractListModel):
         :return: n/a
         :rtype: n/a
         """
-        if not isinstance(value, list):
+        if not isinstance(value, (list, tuple, CompactStringList)):
             raise TypeError("data block MUST be an instance of <type \'list\'>")
-        self.__dict__["block"] = value
+        self.set_items(value)
+
+    def _make_block(self, items):
+        """
+        Returns the storage for the given items
+
+        :param items: the items to store
+        :type items: iterable
+        :return: the storage
+        :rtype: list or instance of <class 'CompactStringList'>
+        """
+        if self.compact:
+            return items if isinstance(items, CompactStringList) else CompactStringList(items)
+        return items if isinstance(items, list) else list(items)
 
     # --------------------------------------------------------------------------
-    # super-class overrides
+    # bulk edits
     # --------------------------------------------------------------------------
-    def rowCount(self, parent):
+    def set_items(self, items):
         """
-        Returns the number of items in the internal data block
+        Replaces every item with a single model reset
 
-        :param parent: parent of the QModelIndex being operated on
-        :type parent: instance of <class 'QModelIndex'>
-        :return: number of rows that this model defines
-        :rtype: int
+        :param items: the new items
+        :type items: iterable
+        :return: n/a
+        :rtype: n/a
+        """
+        self.beginResetModel()
+        self.__dict__["block"] = self._make_block(items)
+        self.endResetModel()
+
+    def extend(self, items):
+        """
+        Appends all of the given items, emitting a single rowsInserted signal
+
+        :param items: the items to append
+        :type items: iterable
+        :return: n/a
+        :rtype: n/a
+        """
+        self.insert_items(len(self.block), items)
+
+    def insert_items(self, position, items):
+        """
+        Inserts all of the given items before the given position, emitting a
+        single rowsInserted signal
+
+        :param position: the row to insert before
+        :type position: int
+        :param items: the items to insert
+        :type items: iterable
+        :return: success status of the operation
+        :rtype: bool
+        """
+        block = self.block
+        if not 0 <= position <= len(block):
+            return False
+        items = list(items)
+        if not items:
+            return True
+        self.beginInsertRows(QtCore.QModelIndex(), position, position + len(items) - 1)
+        if isinstance(block, CompactStringList):
+            block.insert_many(position, items)
+        else:
+            block[position:position] = items
+        self.endInsertRows()
+        return True
+
+    def remove_range(self, position, count):
+        """
+        Removes `count` items starting at the given position, emitting a single
+        rowsRemoved signal
+
+        :param position: the first row to remove
+        :type position: int
+        :param count: number of rows to remove
+        :type count: int
+        :return: success status of the operation
+        :rtype: bool
         """
-        return len(self.block)
+        if position < 0 or count <= 0 or position + count > len(self.block):
+            return False
+        self.beginRemoveRows(QtCore.QModelIndex(), position, position + count - 1)
+        del self.block[position:position + count]
+        self.endRemoveRows()
+        return True
 
-    def columnCount(self, parent):
+    # --------------------------------------------------------------------------
+    # super-class overrides
+    # --------------------------------------------------------------------------
+    def rowCount(self, parent=QtCore.QModelIndex()):
         """
-        Returns the number of columns
+        Returns the number of items in the internal data block
 
         :param parent: parent of the QModelIndex being operated on
         :type parent: instance of <class 'QModelIndex'>
-        :return: number of columns that this model defines
+        :return: number of rows that this model defines
         :rtype: int
         """
-        return 1
+        if parent.isValid():
+            return 0
+        # views call this for every row while laying out - skip the property
+        return len(self.__dict__["block"])
 
     def flags(self, index):
         """
@@ -200,9 +725,14 @@ class ListModel(QtCore.QAbstractListModel):
         :return: aggregated item property flags
         :rtype: QtCore.Qt.ItemFlag attributes
         """
-        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if self.editable:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
 
-    def data(self, index, role):
+    def data(self, index, role=QtCore.Qt.DisplayRole):
         """
         Returns QModelIndex display data based on the requested display role
 
@@ -210,12 +740,14 @@ class ListModel(QtCore.QAbstractListModel):
         :type index: instance of <class 'QModelIndex'>
         :param role: a Qt.ItemDataRole specifying the type of data the view is requesting
         :type role: Qt.ItemDataRole
-        :return: data that informs a view object how to display a QModelIndex 
+        :return: data that informs a view object how to display a QModelIndex
         :rtype: various
         """
-        row = index.row()
-        if role == QtCore.Qt.DisplayRole:
-            return self.block[row]
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole or role == QtCore.Qt.EditRole:
+            return self.block[index.row()]
+        return None
 
     def setData(self, index, value, role=QtCore.Qt.EditRole):
         """
@@ -231,145 +763,49 @@ class ListModel(QtCore.QAbstractListModel):
         :rtype: bool
         """
         # check that model is editable
-        if not self.editable:
+        if not self.editable or not index.isValid() or role != QtCore.Qt.EditRole:
             return False
 
         # edit the main data set
-        row = index.row()
-        value = value.toString()
-        if role == QtCore.Qt.EditRole:
-            self.block[row] = value
-            self.dataChanged.emit(index, index)
-            return True
-        return False
-
-    def index(self, row, column, parent):
-        """
-        Returns the QModelIndex associated with the given row and column
-
-        :param row: The row number
-        :type row: int
-        :param column: Then column number
-        :type column: int
-        :return: the parent of the the given QModelIndex
-        :rtype: instance of <class 'QModelIndex'>
-        """
-        dataItem = self.block[row]
-        index = self.createIndex(row, column, dataItem)
-        return index
-
-    def parent(self, index):
-        """
-        Returns the parent of the the given QModelIndex
-
-        :param index: the QModelInedx whose parent you wish to fetch
-        :type index: instance of <class 'QModelIndex'>
-        :return: the parent of the the given QModelIndex
-        :rtype: instance of <class 'QModelIndex'>
-        """
-        return QtCore.QModelIndex()
+        self.block[index.row()] = value
+        self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole])
+        return True
 
-    def insertRow(self, position, parent=QtCore.QModelIndex()):
+    def insertRows(self, position, count, parent=QtCore.QModelIndex()):
         """
-        Inserts a row into the model at the given position.
-
-        Note:
-            MUST call self.beginInsertRows(index, first, last)
-            first is the start index
-            last is the final index number
+        Inserts `count` empty items into the model at the given position.
 
         :param position: The list index to insert at
         :type position: int
+        :param count: number of rows to insert
+        :type count: int
         :param parent: parent of the QModelIndex being operated on
         :type parent: instance of <class 'QModelIndex'>
+        :return: success status of the operation
+        :rtype: bool
         """
         # check that model is editable
-        if not self.editable:
+        if not self.editable or parent.isValid():
             return False
+        return self.insert_items(position, [""] * count)
 
-        self.beginInsertRows(parent, position, position)
-        newData = ''
-        self.block.insert(position, newData)
-        self.endInsertRows()
-        return True
-
-    def insertRows(self, position, count, parent=QtCore.QModelIndex()):
+    def removeRows(self, position, count, parent=QtCore.QModelIndex()):
         """
-        Inserts rows into the model at the given position.
+        Removes `count` items from the model at the given position.
 
-        Note:
-            MUST call self.beginInsertRows(index, first, last)
-            first is the start index
-            last is the final index number
-
-        :param position: The list index to insert at
+        :param position: The list index to begin removing from
         :type position: int
-        :param count: number of rows to insert
+        :param count: number of rows to remove
         :type count: int
         :param parent: parent of the QModelIndex being operated on
         :type parent: instance of <class 'QModelIndex'>
+        :return: success status of the operation
+        :rtype: bool
         """
         # check that model is editable
-        if not self.editable:
-            return False
-
-        last = position + (count - 1)
-        self.beginInsertRows(parent, position, last)
-        for i in xrange(count):
-            newData = ''
-            self.block.insert(position, newData)
-        self.endInsertRows()
-        return True
-
-    def removeRow(self, position, parent=QtCore.QModelIndex()):
-        """
-        Removes a row from the model at the given position.
-
-        Note:
-            MUST call self.beginInsertRows(index, first, last)
-            first is the start index
-            last is the final index number
-
-        :param position: The list index to remove
-        :type position: int
-        :param parent: parent of the QModelIndex being operated on
-        :type parent: instance of <class 'QModelIndex'>
-        """
-        # check that model is editable
-        if not self.editable:
-            return False
-
-        self.beginRemoveRows(parent, position, position)
-        self.block.pop(position)
-        self.endRemoveRows()
-        return True
-
-    def removeRows(self, position, count, parent=QtCore.QModelIndex()):
-        """
-        Removes rows from the model at the given position.
-
-        Note:
-            MUST call self.beginInsertRows(index, first, last)
-            first is the start index
-            last is the final index number
-
-        :param position: The list index to begin removing from
-        :type position: int
-        :param count: number of rows to remove
-        :type count: int
-        :param parent: parent of the QModelIndex being operated on
-        :type parent: instance of <class 'QModelIndex'>
-        """
-        # check that model is editable
-        if not self.editable:
+        if not self.editable or parent.isValid():
             return False
-
-        last = position + (count - 1)
-        self.beginRemoveRows(parent, position, last)
-        for i in xrange(count):
-            self.block.pop(position)
-        self.endRemoveRows()
-        return True
+        return self.remove_range(position, count)
 
 
 class TableModel(QtCore.QAbstractTableModel):
@@ -377,7 +813,7 @@ class TableModel(QtCore.QAbstractTableModel):
     Generic table model class for use with the PyQt Model/View architecture.
     The internal data block should be a list of nested lists/tuples
     """
-    def __init__(self, block=[], horizontal_labels=[], vertical_labels=[], parent=None):
+    def __init__(self, block=None, horizontal_labels=None, vertical_labels=None, parent=None):
         """
         Defines and initializes each instance object
 
@@ -394,9 +830,10 @@ class TableModel(QtCore.QAbstractTableModel):
         """
         super(TableModel, self).__init__(parent)
 
-        self._block = block
-        self._horizontal_labels = horizontal_labels
-        self._vertical_labels = vertical_labels
+        # never share default containers between instances
+        self._block = block if block is not None else []
+        self._horizontal_labels = horizontal_labels if horizontal_labels is not None else []
+        self._vertical_labels = vertical_labels if vertical_labels is not None else []
 
     # --------------------------------------------------------------------------
     # Managed attributes
@@ -443,6 +880,8 @@ class TableModel(QtCore.QAbstractTableModel):
         :return: n/a
         :rtype: int
         """
+        if parent.isValid():
+            return 0
         return len(self._block)
 
     def columnCount(self, parent=QtCore.QModelIndex()):
@@ -454,6 +893,8 @@ class TableModel(QtCore.QAbstractTableModel):
         :return: number of columns this model contains
         :rtype: int
         """
+        if parent.isValid():
+            return 0
         try:
             return len(self._block[0])
         except IndexError:
@@ -676,284 +1117,2663 @@ class TableModel(QtCore.QAbstractTableModel):
         :return: success status of the operation
         :rtype: bool
         """
-        raise NotImplementedError()
-
-
-class TreeModel(QtCore.QAbstractItemModel):
-    """
-    QAbstractItemModel object representing generic hierarchical data.
-    The Node instance associated with attribute "root" represents a container object
-    which can be used to gather all relevant information about the current
-    variant hierarchy defined by this model
-    For more information please consult the Node class documentation in this module
+        raise NotImplementedError()
+
+
+class _ColumnStore(object):
+    """
+    Contiguous storage for the values of a single ColumnarTableModel column.
+    Typed columns are backed by a numpy array - grown geometrically - or by
+    an array.array when numpy is not available. Untyped columns use a list.
+    """
+    def __init__(self, typecode=None, values=()):
+        """
+        Defines and initializes each instance object
+
+        :param typecode: array typecode (e.g. "d", "q") - None stores any object
+        :type typecode: string
+        :param values: initial values
+        :type values: iterable
+        :return: n/a
+        :rtype: n/a
+        """
+        self.typecode = typecode
+        self._length = 0
+        self._data = self._allocate()
+        self.extend(values)
+
+    def _allocate(self):
+        """
+        Returns new, empty storage for this column's typecode
+
+        :return: new storage
+        :rtype: numpy.ndarray, array.array or list
+        """
+        if self.typecode is None:
+            return []
+        if numpy is not None:
+            return numpy.zeros(0, dtype=self.typecode)
+        return array.array(self.typecode)
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def values(self):
+        """
+        Returns the stored values - a view, not a copy, for numpy columns
+
+        :return: the stored values
+        :rtype: numpy.ndarray, array.array or list
+        """
+        if isinstance(self._data, (list, array.array)):
+            return self._data
+        return self._data[:self._length]
+
+    def get(self, row):
+        """
+        Returns the value of the given row as a Python object
+
+        :param row: the row to query
+        :type row: int
+        :return: the value
+        :rtype: any
+        """
+        value = self._data[row]
+        if numpy is not None and isinstance(value, numpy.generic):
+            return value.item()
+        return value
+
+    def set(self, row, value):
+        """
+        Sets the value of the given row. Typed columns reject values that
+        would not survive the conversion to their typecode unchanged, such as
+        floats stored into integer columns
+
+        :param row: the row to edit
+        :type row: int
+        :param value: the value to set
+        :type value: any
+        :return: n/a
+        :rtype: n/a
+        """
+        if self.typecode is not None:
+            if isinstance(self._data, array.array):
+                converted = array.array(self.typecode, [value])[0]
+            else:
+                converted = self._data.dtype.type(value)
+            # NaN never equals itself, but is kept as NaN by float columns
+            if converted != value and not (converted != converted and value != value):
+                msg = "{0!r} cannot be stored in a {1!r} column".format(value, self.typecode)
+                raise ValueError(msg)
+        self._data[row] = value
+
+    def extend(self, values):
+        """
+        Appends the given values
+
+        :param values: the values to append
+        :type values: iterable
+        :return: n/a
+        :rtype: n/a
+        """
+        if isinstance(self._data, (list, array.array)):
+            self._data.extend(values)
+            self._length = len(self._data)
+            return
+
+        values = numpy.asarray(values, dtype=self.typecode)
+        end = self._length + len(values)
+        if end > len(self._data):
+            grown = numpy.zeros(max(end, 2 * len(self._data)), dtype=self.typecode)
+            grown[:self._length] = self._data[:self._length]
+            self._data = grown
+        self._data[self._length:end] = values
+        self._length = end
+
+    def replace(self, values):
+        """
+        Replaces every value of this column
+
+        :param values: the new values
+        :type values: iterable
+        :return: n/a
+        :rtype: n/a
+        """
+        self._length = 0
+        self._data = self._allocate()
+        self.extend(values)
+
+    def delete(self, first, count):
+        """
+        Removes `count` values starting at the given row
+
+        :param first: the first row to remove
+        :type first: int
+        :param count: number of rows to remove
+        :type count: int
+        :return: n/a
+        :rtype: n/a
+        """
+        if isinstance(self._data, (list, array.array)):
+            del self._data[first:first + count]
+            self._length = len(self._data)
+            return
+        self._data[first:self._length - count] = self._data[first + count:self._length]
+        self._length -= count
+
+
+class ColumnarTableModel(QtCore.QAbstractTableModel):
+    """
+    Table model storing each column in a contiguous, typed array instead of
+    nested Python lists, for tables with millions of rows.
+
+    Columns are added with `add_column`, giving an array typecode such as
+    "d" (float) or "q" (64 bit int) for numeric data - stored in numpy arrays
+    when numpy is available and in array.array objects otherwise - or None for
+    arbitrary objects. Each column may have a formatter, either a format
+    string such as "{:.2f}" or a callable, applied when the view asks for text.
+
+    Bulk edits - set_column, append_rows and remove_rows - touch whole columns
+    and notify views with a single signal.
+
+    Public Attributes:
+        :attr headers: the column headers
+        :type headers: list
+    """
+    NUMERIC_ALIGNMENT = QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter
+
+    def __init__(self, parent=None):
+        """
+        Defines and initializes each instance object
+
+        :param parent: this model object's parent
+        :type parent: instance of <class 'QtCore.QObject'>
+        :return: n/a
+        :rtype: n/a
+        """
+        super(ColumnarTableModel, self).__init__(parent)
+        self._stores = []
+        self._formatters = []
+        self._editable = []
+        self._headers = []
+        self._row_count = 0
+
+    # --------------------------------------------------------------------------
+    # managed attributes
+    # --------------------------------------------------------------------------
+    @property
+    def headers(self):
+        """
+        Returns the column headers
+
+        :return: column headers
+        :rtype: list
+        """
+        return list(self._headers)
+
+    # --------------------------------------------------------------------------
+    # columns
+    # --------------------------------------------------------------------------
+    def column_index(self, column):
+        """
+        Returns the column number of the given column header or number
+
+        :param column: the column header or number
+        :type column: string or int
+        :return: the column number
+        :rtype: int
+        """
+        if isinstance(column, int):
+            return column
+        return self._headers.index(column)
+
+    def add_column(self, header, values=None, typecode=None, formatter=None, editable=False):
+        """
+        Appends a column to this model
+
+        :param header: the column header
+        :type header: string
+        :param values: the column values - must match the current row count
+        :type values: iterable
+        :param typecode: array typecode (e.g. "d", "q") - None stores any object
+        :type typecode: string
+        :param formatter: format string or callable converting values into display text
+        :type formatter: string or callable
+        :param editable: if the column's cells can be edited
+        :type editable: bool
+        :return: the new column's number
+        :rtype: int
+        """
+        store = _ColumnStore(typecode, values if values is not None else ())
+        if self._stores and len(store) != self._row_count:
+            msg = "Column {} has {} rows - expected {}".format(header, len(store), self._row_count)
+            raise ValueError(msg)
+        if isinstance(formatter, str):
+            formatter = formatter.format
+
+        column = len(self._stores)
+        self.beginInsertColumns(QtCore.QModelIndex(), column, column)
+        self._stores.append(store)
+        self._formatters.append(formatter)
+        self._editable.append(editable)
+        self._headers.append(header)
+        self._row_count = len(store)
+        self.endInsertColumns()
+        return column
+
+    def column(self, column):
+        """
+        Returns the values of the given column - a view, not a copy, for numpy columns
+
+        :param column: the column header or number
+        :type column: string or int
+        :return: the column values
+        :rtype: numpy.ndarray, array.array or list
+        """
+        return self._stores[self.column_index(column)].values
+
+    def set_column(self, column, values):
+        """
+        Replaces every value of the given column, emitting a single dataChanged signal
+
+        :param column: the column header or number
+        :type column: string or int
+        :param values: the new values - must match the current row count
+        :type values: iterable
+        :return: n/a
+        :rtype: n/a
+        """
+        column = self.column_index(column)
+        store = self._stores[column]
+        typecode = store.typecode
+        replacement = _ColumnStore(typecode, values)
+        if len(replacement) != self._row_count:
+            msg = "Expected {} values - got {}".format(self._row_count, len(replacement))
+            raise ValueError(msg)
+        self._stores[column] = replacement
+        if self._row_count:
+            first = self.index(0, column)
+            last = self.index(self._row_count - 1, column)
+            self.dataChanged.emit(first, last, [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole])
+
+    def append_rows(self, columns):
+        """
+        Appends rows given column-wise, emitting a single rowsInserted signal
+
+        Usage:
+            model.append_rows({"x": xs, "y": ys})
+            model.append_rows([xs, ys])
+
+        :param columns: the values of every column, keyed by header or in column order
+        :type columns: dict or list
+        :return: n/a
+        :rtype: n/a
+        """
+        if isinstance(columns, dict):
+            columns = [columns[header] for header in self._headers]
+        if len(columns) != len(self._stores):
+            msg = "Expected {} columns - got {}".format(len(self._stores), len(columns))
+            raise ValueError(msg)
+        columns = [
+            values if hasattr(values, "__len__") else list(values)
+            for values in columns
+        ]
+        count = len(columns[0]) if columns else 0
+        if any(len(values) != count for values in columns):
+            raise ValueError("All columns must have the same number of rows")
+        if not count:
+            return
+
+        first = self._row_count
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + count - 1)
+        for store, values in zip(self._stores, columns):
+            store.extend(values)
+        self._row_count += count
+        self.endInsertRows()
+
+    def remove_rows(self, position, count):
+        """
+        Removes `count` rows starting at the given position, emitting a single
+        rowsRemoved signal
+
+        :param position: the first row to remove
+        :type position: int
+        :param count: number of rows to remove
+        :type count: int
+        :return: success status of the operation
+        :rtype: bool
+        """
+        if position < 0 or count <= 0 or position + count > self._row_count:
+            return False
+        self.beginRemoveRows(QtCore.QModelIndex(), position, position + count - 1)
+        for store in self._stores:
+            store.delete(position, count)
+        self._row_count -= count
+        self.endRemoveRows()
+        return True
+
+    # --------------------------------------------------------------------------
+    # superclass overrides
+    # --------------------------------------------------------------------------
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """
+        Returns the number of rows this model contains
+
+        :param parent: The QModelIndex you wish to query
+        :param parent: instance of <class 'QtCore.QModelIndex'>
+        :return: number of rows this model contains
+        :rtype: int
+        """
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """
+        Returns the number of columns this model contains
+
+        :param parent: The QModelIndex you wish to query
+        :param parent: instance of <class 'QtCore.QModelIndex'>
+        :return: number of columns this model contains
+        :rtype: int
+        """
+        if parent.isValid():
+            return 0
+        return len(self._stores)
+
+    def flags(self, index):
+        """
+        Sets the various properties of QModelIndex objects associated with this model
+
+        :param index: The QModelIndex to operate on
+        :param index: instance of <class 'QtCore.QModelIndex'>
+        :return: item data flags
+        :rtype: QtCore.Qt.ItemData flag
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if self._editable[index.column()]:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """
+        Returns a value that this model's view expects for the specified role
+
+        :param index: The QModelIndex to operate on
+        :param index: instance of <class 'QtCore.QModelIndex'>
+        :param role: the item data role whose value you wish to fetch
+        :type role: QtCore.Qt.ItemDataRole value
+        :return: a piece of data from the column stores
+        :rtype: any
+        """
+        if not index.isValid():
+            return None
+        column = index.column()
+
+        if role == QtCore.Qt.DisplayRole:
+            value = self._stores[column].get(index.row())
+            formatter = self._formatters[column]
+            if formatter is not None and value is not None:
+                return formatter(value)
+            return value
+
+        if role == QtCore.Qt.EditRole:
+            return self._stores[column].get(index.row())
+
+        if role == QtCore.Qt.TextAlignmentRole and self._stores[column].typecode is not None:
+            return self.NUMERIC_ALIGNMENT
+
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """
+        Updates a single cell and notifies this model's view that there
+        is new data to display
+
+        :param index: The QModelIndex to operate on
+        :param index: instance of <class 'QtCore.QModelIndex'>
+        :param value: The value to set
+        :param value: any
+        :param role: the item data role being edited
+        :type role: QtCore.Qt.ItemDataRole value
+        :return: success status of the operation
+        :rtype: bool
+        """
+        if role != QtCore.Qt.EditRole or not index.isValid():
+            return False
+        if not self._editable[index.column()]:
+            return False
+        try:
+            self._stores[index.column()].set(index.row(), value)
+        except (TypeError, ValueError, OverflowError):
+            return False
+        self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole])
+        return True
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        """
+        Returns a value that this model's header views expect for the specified role
+
+        :param section: The row/column to operate on
+        :type section: int
+        :param orientation: the header object's orientation
+        :type orientation: {QtCore.Qt.Horizontal, QtCore.Qt.Vertical}
+        :param role: the item data role whose value you wish to fetch
+        :type role: QtCore.Qt.ItemDataRole value
+        :return: the column header
+        :rtype: any
+        """
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            if 0 <= section < len(self._headers):
+                return self._headers[section]
+            return None
+        return super(ColumnarTableModel, self).headerData(section, orientation, role)
+
+    def removeRows(self, position, count, parent=QtCore.QModelIndex()):
+        """
+        Removes multiple rows from this model
+
+        :param position: the first row to remove
+        :type position: int
+        :param count: number of rows to remove
+        :type count: int
+        :param parent: the row's parent index object
+        :type parent: instance of <class 'QtCore.QModelIndex'>
+        :return: success status of the operation
+        :rtype: bool
+        """
+        if parent.isValid():
+            return False
+        return self.remove_rows(position, count)
+
+
+class PagedTableModel(QtCore.QAbstractTableModel):
+    """
+    Read only table model pulling rows from a TableSource in pages of
+    `page_size` rows. At most `cache_pages` pages are kept, in least recently
+    used order, so memory stays constant whatever the size of the source.
+
+    Once a view is attached with `attach_view`, scrolling prefetches the
+    `read_ahead` pages beyond the viewport - in the scroll direction - on a
+    background thread. A page still being prefetched when the view needs it
+    is waited for rather than read twice.
+
+    Usage:
+        model = PagedTableModel(CsvTableSource("huge.csv"))
+        view.setModel(model)
+        model.attach_view(view)
+
+    Public Attributes:
+        :attr source: the row source
+        :type source: instance of <class 'TableSource'>
+        :attr page_size: number of rows per page
+        :type page_size: int
+        :attr cache_pages: maximum number of cached pages
+        :type cache_pages: int
+        :attr read_ahead: number of pages prefetched beyond the viewport
+        :type read_ahead: int
+    """
+    def __init__(self, source, page_size=TABLE_PAGE_SIZE, cache_pages=TABLE_CACHE_PAGES,
+                 read_ahead=TABLE_READ_AHEAD, parent=None):
+        """
+        Defines and initializes each instance object
+
+        :param source: the row source
+        :type source: instance of <class 'TableSource'>
+        :param page_size: number of rows per page
+        :type page_size: int
+        :param cache_pages: maximum number of cached pages
+        :type cache_pages: int
+        :param read_ahead: number of pages prefetched beyond the viewport
+        :type read_ahead: int
+        :param parent: this model object's parent
+        :type parent: instance of <class 'QtCore.QObject'>
+        :return: n/a
+        :rtype: n/a
+        """
+        super(PagedTableModel, self).__init__(parent)
+        self.source = source
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.read_ahead = read_ahead
+
+        self._row_count = source.row_count()
+        self._pages = collections.OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._view = None
+        self._last_first = 0
+
+    # --------------------------------------------------------------------------
+    # paging
+    # --------------------------------------------------------------------------
+    def _read_page(self, page):
+        """
+        Reads the given page from the source
+
+        :param page: the page number
+        :type page: int
+        :return: the page's rows
+        :rtype: list
+        """
+        with self._lock:
+            return self.source.read(page * self.page_size, self.page_size)
+
+    def _store(self, page, rows):
+        """
+        Caches the given page, evicting the least recently used pages
+
+        :param page: the page number
+        :type page: int
+        :param rows: the page's rows
+        :type rows: list
+        :return: n/a
+        :rtype: n/a
+        """
+        self._pages[page] = rows
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.cache_pages:
+            self._pages.popitem(last=False)
+
+    def _harvest(self):
+        """
+        Moves finished prefetches into the page cache
+
+        :return: n/a
+        :rtype: n/a
+        """
+        for page, future in list(self._inflight.items()):
+            if future.done():
+                del self._inflight[page]
+                if not future.cancelled() and future.exception() is None:
+                    self._store(page, future.result())
+
+    def _page(self, page):
+        """
+        Returns the rows of the given page, reading it if needed
+
+        :param page: the page number
+        :type page: int
+        :return: the page's rows
+        :rtype: list
+        """
+        rows = self._pages.get(page)
+        if rows is not None:
+            self._pages.move_to_end(page)
+            return rows
+        future = self._inflight.pop(page, None)
+        if future is not None and not future.cancelled() and future.exception() is None:
+            rows = future.result()
+        else:
+            # a failed prefetch must not raise inside data() - read it again
+            rows = self._read_page(page)
+        self._store(page, rows)
+        return rows
+
+    def prefetch(self, first, last, direction=1):
+        """
+        Schedules background reads of the pages holding rows `first` to `last`
+        and of the `read_ahead` pages beyond them in the given direction
+
+        :param first: the first visible row
+        :type first: int
+        :param last: the last visible row
+        :type last: int
+        :param direction: 1 when scrolling down, -1 when scrolling up
+        :type direction: int
+        :return: n/a
+        :rtype: n/a
+        """
+        self._harvest()
+        last_page = max(self._row_count - 1, 0) // self.page_size
+        first_page = first // self.page_size
+        end_page = last // self.page_size
+        if direction >= 0:
+            end_page += self.read_ahead
+        else:
+            first_page -= self.read_ahead
+        # never prefetch more than the cache can hold
+        budget = max(self.cache_pages - 1, 1)
+        for page in range(max(first_page, 0), min(end_page, last_page) + 1)[:budget]:
+            if page not in self._pages and page not in self._inflight:
+                self._inflight[page] = self._executor.submit(self._read_page, page)
+
+    def attach_view(self, view):
+        """
+        Drives prefetching from the given view's viewport.
+        The view must display this model directly - not through a proxy
+
+        :param view: the view displaying this model
+        :type view: instance of <class 'QAbstractItemView'>
+        :return: n/a
+        :rtype: n/a
+        """
+        self._view = view
+        view.verticalScrollBar().valueChanged.connect(self._on_viewport_changed)
+        self._on_viewport_changed()
+
+    def _on_viewport_changed(self, *args):
+        """
+        Prefetches the pages around the attached view's viewport
+
+        :return: n/a
+        :rtype: n/a
+        """
+        view = self._view
+        if view is None or not self._row_count:
+            return
+        first = max(view.rowAt(0), 0)
+        last = view.rowAt(view.viewport().height() - 1)
+        if last < 0:
+            last = self._row_count - 1
+        direction = -1 if first < self._last_first else 1
+        self._last_first = first
+        self.prefetch(first, last, direction)
+
+    def reload(self):
+        """
+        Re-reads the source from scratch, e.g. after the underlying file changed
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self.beginResetModel()
+        for future in self._inflight.values():
+            future.cancel()
+        with self._lock:
+            self._inflight = {}
+            self._pages.clear()
+            self.source.reload()
+            self._row_count = self.source.row_count()
+        self.endResetModel()
+
+    def close(self):
+        """
+        Stops prefetching and closes the source
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self._executor.shutdown(wait=True)
+        self.source.close()
+
+    # --------------------------------------------------------------------------
+    # superclass overrides
+    # --------------------------------------------------------------------------
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """
+        Returns the number of rows this model contains
+
+        :param parent: The QModelIndex you wish to query
+        :param parent: instance of <class 'QtCore.QModelIndex'>
+        :return: number of rows this model contains
+        :rtype: int
+        """
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """
+        Returns the number of columns this model contains
+
+        :param parent: The QModelIndex you wish to query
+        :param parent: instance of <class 'QtCore.QModelIndex'>
+        :return: number of columns this model contains
+        :rtype: int
+        """
+        if parent.isValid():
+            return 0
+        return len(self.source.headers)
+
+    def flags(self, index):
+        """
+        Sets the various properties of QModelIndex objects associated with this model
+
+        :param index: The QModelIndex to operate on
+        :param index: instance of <class 'QtCore.QModelIndex'>
+        :return: item data flags
+        :rtype: QtCore.Qt.ItemData flag
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """
+        Returns a value that this model's view expects for the specified role
+
+        :param index: The QModelIndex to operate on
+        :param index: instance of <class 'QtCore.QModelIndex'>
+        :param role: the item data role whose value you wish to fetch
+        :type role: QtCore.Qt.ItemDataRole value
+        :return: a value read from the source
+        :rtype: any
+        """
+        if not index.isValid() or role not in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return None
+        row = index.row()
+        rows = self._page(row // self.page_size)
+        offset = row % self.page_size
+        if offset >= len(rows):
+            return None
+        record = rows[offset]
+        column = index.column()
+        return record[column] if column < len(record) else None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        """
+        Returns a value that this model's header views expect for the specified role
+
+        :param section: The row/column to operate on
+        :type section: int
+        :param orientation: the header object's orientation
+        :type orientation: {QtCore.Qt.Horizontal, QtCore.Qt.Vertical}
+        :param role: the item data role whose value you wish to fetch
+        :type role: QtCore.Qt.ItemDataRole value
+        :return: the column header
+        :rtype: any
+        """
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            headers = self.source.headers
+            if 0 <= section < len(headers):
+                return headers[section]
+            return None
+        return super(PagedTableModel, self).headerData(section, orientation, role)
+
+
+class TreeColumn(object):
+    """
+    Specification of a single TreeModel column.
+    Each column maps to a Node attribute - by name - or to a getter callable
+    which receives the Node and returns the value to display.
+
+    Public Attributes:
+        :attr header: the column's header text
+        :type header: string
+        :attr attr: the Node attribute name or getter callable backing this column
+        :type attr: string or callable
+        :attr formatter: optional callable converting values into display values
+        :type formatter: callable
+        :attr editable: if the column can be edited - only for attribute columns
+        :type editable: bool
+    """
+    def __init__(self, header, attr="name", formatter=None, editable=False):
+        """
+        Defines and initializes each instance object
+
+        :param header: the column's header text
+        :type header: string
+        :param attr: the Node attribute name or getter callable backing this column
+        :type attr: string or callable
+        :param formatter: optional callable converting values into display values
+        :type formatter: callable
+        :param editable: if the column can be edited
+        :type editable: bool
+        :return: n/a
+        :rtype: n/a
+        """
+        self.header = header
+        self.attr = attr
+        self.formatter = formatter
+        self.editable = editable and not callable(attr)
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Returns a TreeColumn from a column specification, which may be a
+        TreeColumn, an attribute name or a (header, attr) tuple. Attribute
+        names give editable columns, like the model's default column
+
+        :param spec: the column specification
+        :type spec: TreeColumn, string or tuple
+        :return: the column
+        :rtype: instance of <class 'TreeColumn'>
+        """
+        if isinstance(spec, cls):
+            return spec
+        if isinstance(spec, str):
+            return cls(spec.replace("_", " ").title(), spec, editable=True)
+        return cls(*spec)
+
+    def value(self, node):
+        """
+        Returns the raw value of this column for the given node
+
+        :param node: the node to query
+        :type node: instance of <class 'Node'>
+        :return: the node's value
+        :rtype: any
+        """
+        if callable(self.attr):
+            return self.attr(node)
+        return getattr(node, self.attr, None)
+
+    def display(self, node):
+        """
+        Returns the display value of this column for the given node
+
+        :param node: the node to query
+        :type node: instance of <class 'Node'>
+        :return: the formatted value
+        :rtype: any
+        """
+        value = self.value(node)
+        if self.formatter is not None and value is not None:
+            return self.formatter(value)
+        return value
+
+    def set_value(self, node, value):
+        """
+        Sets the value of this column on the given node
+
+        :param node: the node to edit
+        :type node: instance of <class 'Node'>
+        :param value: the value to set
+        :type value: any
+        :return: success status of the operation
+        :rtype: bool
+        """
+        if not self.editable:
+            return False
+        setattr(node, self.attr, value)
+        return True
+
+
+class TreeModel(QtCore.QAbstractItemModel):
+    """
+    QAbstractItemModel object representing generic hierarchical data.
+    The Node instance associated with attribute "root" represents a container object
+    which can be used to gather all relevant information about the current
+    variant hierarchy defined by this model
+    For more information please consult the Node class documentation in this module
+
+    Children may be populated lazily by passing a `child_provider` callable.
+    It is called with a Node and must return an iterable of that node's
+    unparented child Nodes (or names). The iterable is consumed in pages of
+    `page_size` children as the view expands branches and scrolls, so huge or
+    remote hierarchies are only materialised where they are looked at.
+
+    Columns are described by `columns`, a list of TreeColumn objects or
+    specifications accepted by TreeColumn.from_spec, e.g.
+        TreeModel(root, columns=["name", ("Size", get_size)])
+    Values for the display, edit and tooltip roles are cached per node,
+    column and role until dataChanged is emitted for the node, so repaints
+    do not recompute them. Fonts and colours are shared by every cell.
+
+    Public Attributes:
+        :attr root: the root node of the variant hierarchy defined by this model
+        :type root: instance of <class 'Node'>
+        :attr child_provider: callable returning the children of a node - or None
+        :type child_provider: callable
+        :attr page_size: number of children fetched at a time
+        :type page_size: int
+        :attr columns: the column specifications of this model
+        :type columns: list of <class 'TreeColumn'>
+        :attr item_font: font shared by all cells
+        :type item_font: instance of <class 'QFont'>
+        :attr header_font: font shared by all header sections
+        :type header_font: instance of <class 'QFont'>
+        :attr foreground: brush shared by all cells and header sections
+        :type foreground: instance of <class 'QBrush'>
+    """
+    CACHED_ROLES = frozenset([QtCore.Qt.DisplayRole, QtCore.Qt.EditRole, QtCore.Qt.ToolTipRole])
+
+    def __init__(self, root=None, child_provider=None, page_size=FETCH_PAGE_SIZE, columns=None, parent=None):
+        """
+        Defines and initializes each instance object
+
+        :param root: the root node of the hierarchy - defaults to an empty Node
+        :type root: instance of <class 'Node'>
+        :param child_provider: callable returning an iterable of a node's children
+        :type child_provider: callable
+        :param page_size: number of children fetched at a time
+        :type page_size: int
+        :param columns: column specifications - defaults to an editable "name" column
+        :type columns: list
+        :param parent: this widget's parent
+        :type parent: instance of <class 'QObject'>
+        :return: n/a
+        :rtype: n/a
+        """
+        super(TreeModel, self).__init__(parent)
+        if columns is None:
+            columns = [TreeColumn("Column0", "name", editable=True)]
+        self._columns = [TreeColumn.from_spec(each) for each in columns]
+
+        # shared styling - allocated once instead of on every data() call
+        self.item_font = QtGui.QFont("Arial", 8, QtGui.QFont.Normal)
+        self.header_font = QtGui.QFont("Arial", 8, QtGui.QFont.Bold)
+        self.foreground = QtGui.QBrush(QtGui.QColor(220, 220, 220))
+
+        # role cache - {node: {(column, role): value}}, weakly keyed so nodes
+        # dropped without a removal signal do not stay alive
+        self._cache = weakref.WeakKeyDictionary()
+        self._removing = []
+        self.dataChanged.connect(self._on_data_changed)
+        self.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        self.rowsRemoved.connect(self._on_rows_removed)
+        self.modelReset.connect(self.clear_cache)
+        self.layoutChanged.connect(self.clear_cache)
+        self._root = root if root is not None else Node("root")
+        self.child_provider = child_provider
+        self.page_size = page_size
+
+        # lazy population state - weakly keyed, so discarded nodes drop out
+        self._pending = weakref.WeakKeyDictionary()
+        self._fetched = weakref.WeakSet()
+        self._fetching = False
+        self._fetch_queue = []
+        self._bulk_depth = 0
+
+    # --------------------------------------------------------------------------
+    # managed attributes
+    # --------------------------------------------------------------------------
+    @property
+    def root(self):
+        """
+        Returns the root node of the variant hierarchy defined by this model
+
+        :return: the root node of the variant hierarchy defined by this model
+        :rtype: instance of <class 'Node'>
+        """
+        return self._root
+
+    @root.setter
+    def root(self, value):
+        """
+        Returns the root node of the variant hierarchy defined by this model
+
+        :return: the root node of the variant hierarchy defined by this model
+        :rtype: instance of <class 'Node'>
+        """
+        if not isinstance(value, Node):
+            msg = "Invalid root node. Expected {} - got {}".format(type(Node), type(value))
+            raise TypeError(msg)
+        self.__dict__["_root"] = value
+
+    @property
+    def columns(self):
+        """
+        Returns the column specifications of this model
+
+        :return: the column specifications of this model
+        :rtype: list of <class 'TreeColumn'>
+        """
+        return list(self._columns)
+
+    @columns.setter
+    def columns(self, value):
+        """
+        Replaces the column specifications of this model
+
+        :param value: the new column specifications
+        :type value: list
+        :return: n/a
+        :rtype: n/a
+        """
+        self.beginResetModel()
+        self._columns = [TreeColumn.from_spec(each) for each in value]
+        self.endResetModel()
+
+    # --------------------------------------------------------------------------
+    # role cache
+    # --------------------------------------------------------------------------
+    def clear_cache(self):
+        """
+        Forgets every cached value
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self._cache.clear()
+
+    def node_changed(self, node, roles=None):
+        """
+        Notifies views that the attributes backing the given node's columns
+        have changed, invalidating its cached values
+
+        :param node: the node that changed
+        :type node: instance of <class 'Node'>
+        :param roles: the roles that changed - defaults to all roles
+        :type roles: list
+        :return: n/a
+        :rtype: n/a
+        """
+        first = self.index_of(node, 0)
+        if not first.isValid():
+            self._cache.pop(node, None)
+            return
+        last = self.index_of(node, len(self._columns) - 1)
+        self.dataChanged.emit(first, last, roles or [])
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        """
+        Drops the cached values of the changed cells
+
+        :param top_left: the top left changed QModelIndex
+        :type top_left: instance of <class 'QModelIndex'>
+        :param bottom_right: the bottom right changed QModelIndex
+        :type bottom_right: instance of <class 'QModelIndex'>
+        :param roles: the roles that changed - all roles if empty
+        :type roles: list
+        :return: n/a
+        :rtype: n/a
+        """
+        if not top_left.isValid():
+            return
+        parent_node = self._get_node(top_left.parent())
+        columns = range(top_left.column(), bottom_right.column() + 1)
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            entries = self._cache.get(parent_node.child(row))
+            if not entries:
+                continue
+            for key in list(entries):
+                if key[0] in columns and (not roles or key[1] in roles):
+                    del entries[key]
+
+    def _on_rows_about_to_be_removed(self, parent, first, last):
+        """
+        Remembers the rows about to be removed, so their cached values can be
+        dropped once they are gone - views may still query them until then
+
+        :param parent: the QModelIndex rows are removed from
+        :type parent: instance of <class 'QModelIndex'>
+        :param first: the first removed row
+        :type first: int
+        :param last: the last removed row
+        :type last: int
+        :return: n/a
+        :rtype: n/a
+        """
+        parent_node = self._get_node(parent)
+        self._removing.extend(parent_node.child(row) for row in range(first, last + 1))
+
+    def _on_rows_removed(self, *args):
+        """
+        Drops the cached values of the removed rows and their descendants
+
+        :return: n/a
+        :rtype: n/a
+        """
+        removing, self._removing = self._removing, []
+        if not self._cache:
+            return
+        for node in removing:
+            self._cache.pop(node, None)
+            for each in node.descendants():
+                self._cache.pop(each, None)
+
+    # --------------------------------------------------------------------------
+    # general
+    # --------------------------------------------------------------------------
+    def _get_node(self, index):
+        """
+        Returns the instance of <class 'Node'> associated with the given QModelIndex
+
+        :param index: the QModelIndex to operate on
+        :type index: instance of <class 'QModelIndex'>
+        :return: the instance of <class 'Node'> associated with the given QModelIndex
+        :rtype: instance of <class 'Node'>
+        """
+        if index and index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def _is_fetched(self, node):
+        """
+        Returns if all of the given node's children have been materialised
+
+        :param node: the node to query
+        :type node: instance of <class 'Node'>
+        :return: if the node has no more children to fetch
+        :rtype: bool
+        """
+        return self.child_provider is None or node in self._fetched
+
+    def _prune_pending(self):
+        """
+        Releases the pending child iterators of nodes that are no longer part
+        of this model's hierarchy. Their children stay as loaded so far
+
+        :return: n/a
+        :rtype: n/a
+        """
+        for node in list(self._pending.keys()):
+            ancestor = node
+            while ancestor is not None and ancestor is not self._root:
+                ancestor = ancestor.parent
+            if ancestor is None:
+                del self._pending[node]
+                self._fetched.add(node)
+
+    def reset_fetched(self):
+        """
+        Forgets the lazy population state, so the child provider is asked
+        again for any node whose children have not been fully fetched
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self.beginResetModel()
+        self._pending.clear()
+        self._fetched.clear()
+        self._fetch_queue = []
+        self.endResetModel()
+
+    # --------------------------------------------------------------------------
+    # super-class overrides
+    # --------------------------------------------------------------------------
+    def rowCount(self, index=QtCore.QModelIndex()):
+        """
+        Returns the number of children associated with the specified QModelIndex
+
+        :param index: the QModel index to query
+        :type index: instance of <class 'QModelIndex'>
+        :return: number of children
+        :rtype: int
+        """
+        if index and index.isValid() and index.column() > 0:
+            return 0
+        return self._get_node(index).child_count
+
+    def columnCount(self, index=QtCore.QModelIndex()):
+        """
+        Returns the number of objects associated with the children
+        of the specified QModelIndex
+
+        :param index: the QModel index to query
+        :type index: instance of <class 'QModelIndex'>
+        :return: number of data objects
+        :rtype: int
+        """
+        return len(self._columns)
+
+    def flags(self, index):
+        """
+        Defines various properties of the specified QModelIndex.
+
+        :param index: the QModel index to operate on
+        :type index: instance of <class 'QModelIndex'>
+        :return: aggregated ItemDataFlags
+        :rtype: QtCore.Qt.ItemDataFlags
+        """
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if self._columns[index.column()].editable:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role):
+        """
+        Returns an appropriate value for the role that the view is requesting
+
+        :param index: the QModelIndex representing the view data to fetch
+        :type index: instance of <class 'QModelIndex'>
+        :param role: a role indicating the type of data the view is requesting
+        :type role: Qt.ItemDataRole constant
+        :return: a view role specific value
+        :rtype: various
+        """
+        column = index.column()
+        if not index.isValid() or column >= len(self._columns):
+            return None
+
+        # text
+        if role in self.CACHED_ROLES:
+            node = index.internalPointer()
+            entries = self._cache.get(node)
+            if entries is None:
+                entries = self._cache[node] = {}
+            key = (column, role)
+            if key in entries:
+                return entries[key]
+            spec = self._columns[column]
+            value = spec.value(node) if role == QtCore.Qt.EditRole else spec.display(node)
+            entries[key] = value
+            return value
+
+        # font
+        if role == QtCore.Qt.FontRole:
+            return self.item_font
+
+        # color
+        if role == QtCore.Qt.ForegroundRole:
+            return self.foreground
+
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """
+        Updates the internal data block and notifies this model's view that there
+        is new data to display
+
+        :param index: The QModelIndex to operate on
+        :param index: instance of <class 'QtCore.QModelIndex'>
+        :param value: The value to set
+        :param value: instance of <class 'QtCore.QVariant'>
+        :param role: a role indicating the type of data the view is requesting
+        :type role: Qt.ItemDataRole constant
+        :return: success status of the operation
+        :rtype: bool
+        """
+        # check if we should be editing
+        if role != QtCore.Qt.EditRole:
+            return False
+
+        # perform edit
+        node = index.internalPointer()
+        if value and self._columns[index.column()].set_value(node, value):
+            # getter columns of the same node may depend on the edited attribute
+            self._cache.pop(node, None)
+            self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole, QtCore.Qt.ToolTipRole])
+            return True
+
+        return False
+
+    def headerData(self, section, orientation, role):
+        """
+        Returns an appropriate value for the role that the header view is requesting
+
+        :param section: the row or column number being requested
+        :type section: int
+        :param orientation: the header view orientation - (Qt.Horizontal, Qt.Vertical
+        :type orientation: Qt.Orientation constant
+        :param role: a role indicating the type of data the view is requesting
+        :type role: Qt.ItemDataRole constant
+        :return: a view role specific value
+        :rtype: various
+        """
+        if orientation == QtCore.Qt.Vertical or not 0 <= section < len(self._columns):
+            return None
+
+        # text
+        if role == QtCore.Qt.DisplayRole:
+            return self._columns[section].header
+
+        # font
+        if role == QtCore.Qt.FontRole:
+            return self.header_font
+
+        # color
+        if role == QtCore.Qt.ForegroundRole:
+            return self.foreground
+
+        return None
+
+    def parent(self, index):
+        """
+        Returns the parent of the specified QModelIndex
+
+        :param index: the QModelIndex to operate on
+        :type index: instance of <class 'QModelIndex'>
+        :return: the parent of the specified QModelIndex
+        :rtype: instance of <class 'QModelIndex'>
+        """
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self._root:
+            return QtCore.QModelIndex()
+        return self.createIndex(parent_node.index, 0, parent_node)
+
+    def createIndex(self, row, column, object_):
+        """
+        Creates a QModelIndex object for the specified row and column
+        that is associated with the given object
+
+        :param row: the row number
+        :type row: int
+        :param column: the column number
+        :type column:  int
+        :param object_: the object the QModelIndex is associalted with
+        :type object_: any
+        :return:
+        :rtype: instance of <class 'QModelIndex'>
+        """
+        return super(TreeModel, self).createIndex(row, column, object_)
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        """
+        Returns a QModelIndex for the given row and column, with the specified parent
+
+        :param row: the child index's row number relative to the specified parent index
+        :type row: int
+        :param column: the child index's column number relative to the specified parent index
+        :type column: int
+        :param parent: QModelIndex whose child index you wish to fetch
+        :type parent: instance of <class 'QModelIndex'>
+        :return: child index
+        :rtype: instance of <class 'QModelIndex'>
+        """
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+
+        # get Node object - and remember its position for parent lookups
+        parent_node = self._get_node(parent)
+        child_node = parent_node.child(row)
+        child_node._index_hint = row
+
+        return self.createIndex(row, column, child_node)
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        """
+        Returns if the specified QModelIndex has - or may lazily fetch - children
+
+        :param parent: the QModelIndex to query
+        :type parent: instance of <class 'QModelIndex'>
+        :return: if the index has children
+        :rtype: bool
+        """
+        if parent.isValid() and parent.column() > 0:
+            return False
+        node = self._get_node(parent)
+        return node.child_count > 0 or not self._is_fetched(node)
+
+    def canFetchMore(self, parent):
+        """
+        Returns if the child provider may still have children for the specified QModelIndex
+
+        :param parent: the QModelIndex to query
+        :type parent: instance of <class 'QModelIndex'>
+        :return: if more children can be fetched
+        :rtype: bool
+        """
+        if parent.isValid() and parent.column() > 0:
+            return False
+        return not self._is_fetched(self._get_node(parent))
+
+    def fetchMore(self, parent):
+        """
+        Materialises the next page of children of the specified QModelIndex
+
+        :param parent: the QModelIndex to populate
+        :type parent: instance of <class 'QModelIndex'>
+        :return: n/a
+        :rtype: n/a
+        """
+        node = self._get_node(parent)
+        if self._is_fetched(node):
+            return
+        if self._fetching:
+            # views may re-enter fetchMore while rows are being inserted -
+            # rows can't be inserted under another parent until this is done
+            self._fetch_queue.append((parent.isValid(), QtCore.QPersistentModelIndex(parent)))
+            return
+
+        children = self._pending.get(node)
+        if children is None:
+            children = iter(self.child_provider(node) or [])
+            self._pending[node] = children
+
+        page = []
+        for child in itertools.islice(children, self.page_size):
+            if not isinstance(child, Node):
+                child = Node(str(child))
+            page.append(child)
+        if len(page) < self.page_size:
+            self._pending.pop(node, None)
+            self._fetched.add(node)
+
+        if not page:
+            return
+        first = node.child_count
+        self._fetching = True
+        try:
+            self.beginInsertRows(parent, first, first + len(page) - 1)
+            for child in page:
+                child.parent = node
+            self.endInsertRows()
+        finally:
+            self._fetching = False
+
+        # serve the requests that arrived meanwhile
+        queue, self._fetch_queue = self._fetch_queue, []
+        for is_valid, index in queue:
+            if is_valid and not index.isValid():
+                # removed in the meantime
+                continue
+            self.fetchMore(QtCore.QModelIndex(index))
+
+    def insertRows(self, row, count=1, parent=QtCore.QModelIndex()):
+        """
+        Inserts `count` new default nodes before the given row
+
+        :param row: the row to insert before
+        :type row: int
+        :param count: number of rows to insert
+        :type count: int
+        :param parent: the QModelIndex to insert under
+        :type parent: instance of <class 'QModelIndex'>
+        :return: success status of the operation
+        :rtype: bool
+        """
+        nodes = [Node("child{}".format(row + i)) for i in range(count)]
+        return self.insert_nodes(nodes, row, parent)
+
+    def removeRows(self, row, count=1, parent=QtCore.QModelIndex()):
+        """
+        Removes `count` rows starting at the given row
+
+        :param row: the first row to remove
+        :type row: int
+        :param count: number of rows to remove
+        :type count: int
+        :param parent: the QModelIndex to remove from
+        :type parent: instance of <class 'QModelIndex'>
+        :return: success status of the operation
+        :rtype: bool
+        """
+        return self.remove_range(row, count, parent) is not None
+
+    def moveRows(self, source_parent, source_row, count, destination_parent, destination_row):
+        """
+        Moves `count` rows starting at `source_row` under `destination_parent`
+
+        :param source_parent: the QModelIndex to move rows from
+        :type source_parent: instance of <class 'QModelIndex'>
+        :param source_row: the first row to move
+        :type source_row: int
+        :param count: number of rows to move
+        :type count: int
+        :param destination_parent: the QModelIndex to move rows to
+        :type destination_parent: instance of <class 'QModelIndex'>
+        :param destination_row: the row to move before, in pre-move coordinates
+        :type destination_row: int
+        :return: success status of the operation
+        :rtype: bool
+        """
+        return self.move_rows(source_row, count, source_parent, destination_parent, destination_row)
+
+    # --------------------------------------------------------------------------
+    # batch mutation
+    # --------------------------------------------------------------------------
+    def index_of(self, node, column=0):
+        """
+        Returns the QModelIndex of the given node, or an invalid index if the
+        node is the root node or is not part of this model's hierarchy
+
+        :param node: the node to query
+        :type node: instance of <class 'Node'>
+        :param column: the column of the index
+        :type column: int
+        :return: the node's QModelIndex
+        :rtype: instance of <class 'QModelIndex'>
+        """
+        ancestor = node
+        while ancestor is not None and ancestor is not self._root:
+            ancestor = ancestor.parent
+        if ancestor is None or node is self._root:
+            return QtCore.QModelIndex()
+        return self.createIndex(node.index, column, node)
+
+    def insert_nodes(self, nodes, row=None, parent=QtCore.QModelIndex()):
+        """
+        Inserts all of the given nodes before the given row, emitting a single
+        rowsInserted signal. Non Node items are wrapped in a Node named after them.
+        Nodes already part of this model should be moved with `move_rows`
+
+        :param nodes: the nodes to insert
+        :type nodes: iterable of <class 'Node'>
+        :param row: the row to insert before - defaults to the end
+        :type row: int
+        :param parent: the QModelIndex to insert under
+        :type parent: instance of <class 'QModelIndex'>
+        :return: success status of the operation
+        :rtype: bool
+        """
+        parent_node = self._get_node(parent)
+        if row is None:
+            row = parent_node.child_count
+        if row < 0 or row > parent_node.child_count:
+            return False
+
+        nodes = [each if isinstance(each, Node) else Node(str(each)) for each in nodes]
+        if not nodes:
+            return True
+        self.beginInsertRows(parent, row, row + len(nodes) - 1)
+        parent_node.insert_children(row, nodes)
+        self.endInsertRows()
+        return True
+
+    def remove_range(self, row, count, parent=QtCore.QModelIndex()):
+        """
+        Removes `count` rows starting at the given row, emitting a single
+        rowsRemoved signal
+
+        :param row: the first row to remove
+        :type row: int
+        :param count: number of rows to remove
+        :type count: int
+        :param parent: the QModelIndex to remove from
+        :type parent: instance of <class 'QModelIndex'>
+        :return: the removed nodes, or None if the range is invalid
+        :rtype: list
+        """
+        parent_node = self._get_node(parent)
+        if row < 0 or count < 0 or row + count > parent_node.child_count:
+            return None
+        if not count:
+            return []
+
+        self.beginRemoveRows(parent, row, row + count - 1)
+        removed = parent_node.remove_children(row, count)
+        self.endRemoveRows()
+        if self._pending:
+            self._prune_pending()
+        return removed
+
+    def move_rows(self, row, count, source_parent, destination_parent, destination_row=None):
+        """
+        Moves - and possibly reparents - `count` rows starting at the given row,
+        emitting a single rowsMoved signal so views keep their expansion and
+        selection state
+
+        :param row: the first row to move
+        :type row: int
+        :param count: number of rows to move
+        :type count: int
+        :param source_parent: the QModelIndex to move rows from
+        :type source_parent: instance of <class 'QModelIndex'>
+        :param destination_parent: the QModelIndex to move rows to
+        :type destination_parent: instance of <class 'QModelIndex'>
+        :param destination_row: the row to move before, in pre-move coordinates - defaults to the end
+        :type destination_row: int
+        :return: success status of the operation
+        :rtype: bool
+        """
+        source_node = self._get_node(source_parent)
+        destination_node = self._get_node(destination_parent)
+        if destination_row is None:
+            destination_row = destination_node.child_count
+        if row < 0 or count <= 0 or row + count > source_node.child_count:
+            return False
+        if destination_row < 0 or destination_row > destination_node.child_count:
+            return False
+
+        # Qt refuses no-op moves and moves into the moved rows' own subtree
+        last = row + count - 1
+        if not self.beginMoveRows(source_parent, row, last, destination_parent, destination_row):
+            return False
+        nodes = source_node.remove_children(row, count)
+        if source_node is destination_node and destination_row > row:
+            destination_row -= count
+        destination_node.insert_children(destination_row, nodes)
+        self.endMoveRows()
+        return True
+
+    def reparent(self, node, parent_node, row=None):
+        """
+        Moves the given node under `parent_node`
+
+        :param node: the node to move
+        :type node: instance of <class 'Node'>
+        :param parent_node: the node's new parent
+        :type parent_node: instance of <class 'Node'>
+        :param row: the row to move before - defaults to the end
+        :type row: int
+        :return: success status of the operation
+        :rtype: bool
+        """
+        source = node.parent
+        if source is None:
+            return False
+        source_index = self.index_of(source)
+        destination_index = self.index_of(parent_node)
+        return self.move_rows(node.index, 1, source_index, destination_index, row)
+
+    @contextlib.contextmanager
+    def bulk_update(self):
+        """
+        Context manager for arbitrary structural edits of the node hierarchy.
+        Views are told about the edit with a single layoutChanged signal once
+        the block exits and persistent indexes are remapped to their nodes'
+        new positions - or invalidated if their nodes were removed.
+        Nested blocks only notify once, when the outermost block exits
+
+        Usage:
+            with model.bulk_update() as root:
+                for node in nodes:
+                    node.parent = root
+
+        :return: the root node of this model
+        :rtype: instance of <class 'Node'>
+        """
+        if self._bulk_depth:
+            self._bulk_depth += 1
+            try:
+                yield self._root
+            finally:
+                self._bulk_depth -= 1
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        nodes = [(index.internalPointer(), index.column()) for index in persistent]
+        self._bulk_depth = 1
+        try:
+            yield self._root
+        finally:
+            self._bulk_depth = 0
+            current = [self.index_of(node, column) for node, column in nodes]
+            self.changePersistentIndexList(persistent, current)
+            self.layoutChanged.emit()
+            if self._pending:
+                self._prune_pending()
+
+
+class IndexedFilterProxyModel(QtCore.QSortFilterProxyModel):
+    """
+    QSortFilterProxyModel that filters and sorts from a precomputed index
+    instead of querying the source model from Python callbacks.
+
+    The display values of every source row are snapshotted into an index -
+    in chunks of `chunk_size` rows per event loop iteration, as models may
+    only be read from the GUI thread. Matching the filter text, keeping the
+    ancestors of matching tree rows visible and computing sort keys then
+    run in a background thread, and the results are applied with a single
+    invalidation. filterAcceptsRow and lessThan reduce to dictionary lookups.
+
+    Filtering is incremental: typing more characters only re-examines the
+    previous matches, and results for superseded filter texts are dropped.
+    Rows appended to the source (e.g. by fetchMore) and edited rows are
+    indexed in place; other structural changes trigger a re-index.
+
+    Usage:
+        proxy = IndexedFilterProxyModel()
+        proxy.setSourceModel(model)
+        line_edit.textChanged.connect(proxy.set_filter_text)
+
+    Public Attributes:
+        :attr chunk_size: number of source rows indexed per event loop iteration
+        :type chunk_size: int
+        :attr sort_key: optional callable converting display values into sort keys
+        :type sort_key: callable
+        :attr indexing_finished: signal emitted once the source model is indexed
+        :type indexing_finished: instance of <class 'pyqtSignal'>
+    """
+    indexing_finished = QtCore.pyqtSignal()
+    _results_ready = QtCore.pyqtSignal(int, object)
+
+    def __init__(self, parent=None, chunk_size=INDEX_CHUNK_SIZE, sort_key=None):
+        """
+        Defines and initializes each instance object
+
+        :param parent: this object's parent
+        :type parent: instance of <class 'QObject'>
+        :param chunk_size: number of source rows indexed per event loop iteration
+        :type chunk_size: int
+        :param sort_key: optional callable converting display values into sort keys
+        :type sort_key: callable
+        :return: n/a
+        :rtype: n/a
+        """
+        super(IndexedFilterProxyModel, self).__init__(parent)
+        # the index is kept up to date by this class - not by per row callbacks
+        self.setDynamicSortFilter(False)
+        self.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.chunk_size = chunk_size
+        self.sort_key = sort_key
+
+        self._values = {}       # {source path: tuple of display values}
+        self._sort_keys = {}    # {column: {source path: sort key}}
+        self._needle = ""
+        self._matches = None    # paths matching the filter - None accepts all
+        self._accepted = None   # matches plus their ancestors
+        self._stale = True
+        self._generation = 0
+        self._pending_sort = None
+        self._connections = []
+
+        self._indexer = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._index_chunk)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._results_ready.connect(self._apply_results)
+        # release the worker thread with the proxy. A finalizer rather than
+        # the destroyed signal - calling into Python from a QObject being
+        # torn down during garbage collection is not safe
+        weakref.finalize(self, self._executor.shutdown, wait=False)
+
+    # --------------------------------------------------------------------------
+    # managed attributes
+    # --------------------------------------------------------------------------
+    @property
+    def filter_text(self):
+        """
+        Returns the current filter text
+
+        :return: the current filter text
+        :rtype: string
+        """
+        return self._needle
+
+    @property
+    def is_indexing(self):
+        """
+        Returns if the source model is currently being indexed
+
+        :return: if the source model is currently being indexed
+        :rtype: bool
+        """
+        return self._stale
+
+    # --------------------------------------------------------------------------
+    # indexing
+    # --------------------------------------------------------------------------
+    def setSourceModel(self, model):
+        """
+        Sets the model to proxy and starts indexing it
+
+        :param model: the source model
+        :type model: instance of <class 'QAbstractItemModel'>
+        :return: n/a
+        :rtype: n/a
+        """
+        for signal, slot in self._connections:
+            signal.disconnect(slot)
+        self._connections = []
+        super(IndexedFilterProxyModel, self).setSourceModel(model)
+        if model is not None:
+            self._connections = [
+                (model.modelReset, self.reindex),
+                (model.layoutChanged, self.reindex),
+                (model.rowsMoved, self.reindex),
+                (model.rowsRemoved, self.reindex),
+                (model.columnsInserted, self.reindex),
+                (model.columnsRemoved, self.reindex),
+                (model.rowsInserted, self._on_rows_inserted),
+                (model.dataChanged, self._on_data_changed),
+            ]
+            for signal, slot in self._connections:
+                signal.connect(slot)
+        self.reindex()
+
+    def reindex(self, *args):
+        """
+        Discards the index and rebuilds it from the source model
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self._timer.stop()
+        self._generation += 1
+        # new containers - a worker may still be reading the old ones
+        self._values = {}
+        self._sort_keys = {}
+        self._stale = True
+        model = self.sourceModel()
+        if model is None:
+            self._indexer = None
+            return
+        self._indexer = self._iter_rows(model, QtCore.QModelIndex(), ())
+        self._timer.start()
+
+    def close(self):
+        """
+        Stops indexing and shuts down the background worker thread, which
+        otherwise lives until the proxy is garbage collected
+
+        :return: n/a
+        :rtype: n/a
+        """
+        self._timer.stop()
+        self._generation += 1
+        self._executor.shutdown(wait=True)
+
+    def _iter_rows(self, model, parent, path):
+        """
+        Yields the source path and display values of every row below the given
+        source index, without fetching children that are not loaded yet
+
+        :param model: the source model
+        :type model: instance of <class 'QAbstractItemModel'>
+        :param parent: the source index to walk
+        :type parent: instance of <class 'QModelIndex'>
+        :param path: the source path of `parent`
+        :type path: tuple
+        :return: (path, values) pairs
+        :rtype: generator
+        """
+        stack = [(QtCore.QPersistentModelIndex(parent), path)]
+        while stack:
+            parent, path = stack.pop()
+            parent = QtCore.QModelIndex(parent)
+            columns = self._column_count(model, parent)
+            for row in range(model.rowCount(parent)):
+                row_path = path + (row,)
+                yield row_path, self._row_values(model, row, columns, parent)
+                index = model.index(row, 0, parent)
+                if self._has_children(model, index):
+                    stack.append((QtCore.QPersistentModelIndex(index), row_path))
+
+    @staticmethod
+    def _column_count(model, parent):
+        """
+        Returns the number of columns below the given source index
+
+        :param model: the source model
+        :type model: instance of <class 'QAbstractItemModel'>
+        :param parent: the source parent index
+        :type parent: instance of <class 'QModelIndex'>
+        :return: number of columns
+        :rtype: int
+        """
+        if isinstance(model, QtCore.QAbstractListModel):
+            # columnCount is private to QAbstractListModel in PyQt5
+            return 0 if parent.isValid() else 1
+        return model.columnCount(parent)
+
+    @staticmethod
+    def _has_children(model, index):
+        """
+        Returns if the given source index has loaded children. Flat models
+        that ignore the parent in rowCount are caught by the child index
+        being invalid
+
+        :param model: the source model
+        :type model: instance of <class 'QAbstractItemModel'>
+        :param index: the source index to query
+        :type index: instance of <class 'QModelIndex'>
+        :return: if the index has children
+        :rtype: bool
+        """
+        return model.rowCount(index) > 0 and model.index(0, 0, index).isValid()
+
+    @staticmethod
+    def _row_values(model, row, columns, parent):
+        """
+        Returns the display values of the given source row
+
+        :param model: the source model
+        :type model: instance of <class 'QAbstractItemModel'>
+        :param row: the source row
+        :type row: int
+        :param columns: number of columns
+        :type columns: int
+        :param parent: the source parent index
+        :type parent: instance of <class 'QModelIndex'>
+        :return: the row's display values
+        :rtype: tuple
+        """
+        return tuple(
+            model.data(model.index(row, column, parent), QtCore.Qt.DisplayRole)
+            for column in range(columns)
+        )
+
+    def _index_chunk(self):
+        """
+        Indexes the next chunk of source rows
+
+        :return: n/a
+        :rtype: n/a
+        """
+        values = self._values
+        count = 0
+        for path, row_values in itertools.islice(self._indexer, self.chunk_size):
+            values[path] = row_values
+            count += 1
+        if count == self.chunk_size:
+            return
+
+        self._timer.stop()
+        self._indexer = None
+        self._stale = False
+        self.indexing_finished.emit()
+        self._refilter(narrowing=False)
+        if self.sortColumn() >= 0:
+            self._request_sort_keys(self.sortColumn())
+
+    @staticmethod
+    def _source_path(index):
+        """
+        Returns the row numbers leading from the source root to the given index
+
+        :param index: the source index
+        :type index: instance of <class 'QModelIndex'>
+        :return: the source path
+        :rtype: tuple
+        """
+        path = []
+        while index.isValid():
+            path.append(index.row())
+            index = index.parent()
+        path.reverse()
+        return tuple(path)
+
+    def _on_rows_inserted(self, parent, first, last):
+        """
+        Indexes rows appended to the source model in place and re-indexes
+        the model for any other insertion, which shifts existing paths
+
+        :param parent: the source index rows were inserted under
+        :type parent: instance of <class 'QModelIndex'>
+        :param first: the first inserted row
+        :type first: int
+        :param last: the last inserted row
+        :type last: int
+        :return: n/a
+        :rtype: n/a
+        """
+        model = self.sourceModel()
+        if self._stale or last != model.rowCount(parent) - 1:
+            self.reindex()
+            return
+
+        path = self._source_path(parent)
+        added = {}
+        columns = self._column_count(model, parent)
+        for row in range(first, last + 1):
+            row_path = path + (row,)
+            added[row_path] = self._row_values(model, row, columns, parent)
+            index = model.index(row, 0, parent)
+            if self._has_children(model, index):
+                added.update(self._iter_rows(model, index, row_path))
+        self._values.update(added)
+        if self._matches is not None:
+            self._add_matches(each for each, values in added.items() if self._row_matches(values))
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        """
+        Refreshes the index entries of edited source rows
+
+        :param top_left: the top left changed source index
+        :type top_left: instance of <class 'QModelIndex'>
+        :param bottom_right: the bottom right changed source index
+        :type bottom_right: instance of <class 'QModelIndex'>
+        :param roles: the roles that changed - all roles if empty
+        :type roles: list
+        :return: n/a
+        :rtype: n/a
+        """
+        if self._stale or not top_left.isValid():
+            return
+        if roles and QtCore.Qt.DisplayRole not in roles:
+            return
+
+        model = self.sourceModel()
+        parent = top_left.parent()
+        path = self._source_path(parent)
+        columns = self._column_count(model, parent)
+        lost = False
+        found = []
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            row_path = path + (row,)
+            row_values = self._row_values(model, row, columns, parent)
+            self._values[row_path] = row_values
+            for keys in self._sort_keys.values():
+                keys.pop(row_path, None)
+            if self._matches is None:
+                continue
+            if self._row_matches(row_values):
+                if row_path not in self._matches:
+                    found.append(row_path)
+            elif row_path in self._matches:
+                lost = True
+
+        if lost:
+            # ancestors may have lost their last match - recompute them all
+            self._refilter(narrowing=False)
+        elif found:
+            self._add_matches(found)
+
+    # --------------------------------------------------------------------------
+    # filtering
+    # --------------------------------------------------------------------------
+    def set_filter_text(self, text):
+        """
+        Filters the source rows whose filter key column contains the given text.
+        When the filter key column is -1 every column is searched.
+        Rows with matching descendants stay visible
+
+        :param text: the text to search for - an empty string shows all rows
+        :type text: string
+        :return: n/a
+        :rtype: n/a
+        """
+        previous = self._needle
+        self._needle = text or ""
+        self._generation += 1
+        if not self._needle:
+            self._matches = self._accepted = None
+            self.invalidateFilter()
+            return
+        if self._stale:
+            # applied once indexing completes
+            return
+        self._refilter(narrowing=bool(previous) and self._needle.startswith(previous))
+
+    def _case_fold(self):
+        """
+        Returns the text normalisation function implied by filterCaseSensitivity
+
+        :return: text normalisation function
+        :rtype: callable
+        """
+        if self.filterCaseSensitivity() == QtCore.Qt.CaseInsensitive:
+            return lambda text: text.lower()
+        return lambda text: text
+
+    def _row_matches(self, values):
+        """
+        Returns if the given display values match the current filter text
+
+        :param values: the row's display values
+        :type values: tuple
+        :return: if the row matches
+        :rtype: bool
+        """
+        fold = self._case_fold()
+        return self._match(values, fold(self._needle), self.filterKeyColumn(), fold)
+
+    @staticmethod
+    def _match(values, needle, column, fold):
+        """
+        Returns if the given display values contain the (folded) needle
+
+        :param values: the row's display values
+        :type values: tuple
+        :param needle: the folded text to search for
+        :type needle: string
+        :param column: the column to search - -1 searches every column
+        :type column: int
+        :param fold: text normalisation function
+        :type fold: callable
+        :return: if the row matches
+        :rtype: bool
+        """
+        if column >= 0:
+            values = values[column:column + 1]
+        for value in values:
+            if value is not None and needle in fold(str(value)):
+                return True
+        return False
+
+    def _add_matches(self, paths):
+        """
+        Adds the given paths - and their ancestors - to the current matches
+
+        :param paths: the matching source paths
+        :type paths: iterable of tuple
+        :return: n/a
+        :rtype: n/a
+        """
+        reveal = False
+        for path in paths:
+            self._matches.add(path)
+            if path in self._accepted:
+                continue
+            for i in range(len(path) - 1, 0, -1):
+                if path[:i] in self._accepted:
+                    break
+                self._accepted.add(path[:i])
+            self._accepted.add(path)
+            reveal = True
+        if reveal:
+            # dynamic filtering is off - newly accepted rows (and their hidden
+            # ancestors) only show up once the filter is invalidated
+            self.invalidateFilter()
+
+    def _refilter(self, narrowing):
+        """
+        Matches the index against the current filter text in the background
+
+        :param narrowing: if only the previous matches need to be examined
+        :type narrowing: bool
+        :return: n/a
+        :rtype: n/a
+        """
+        self._generation += 1
+        if not self._needle:
+            return
+        fold = self._case_fold()
+        candidates = self._matches if narrowing and self._matches is not None else None
+        self._executor.submit(
+            self._compute_matches, self._generation, self._values, candidates,
+            fold(self._needle), self.filterKeyColumn(), fold
+        )
+
+    def _request_sort_keys(self, column):
+        """
+        Computes the sort keys of the given column in the background
+
+        :param column: the column to compute sort keys for
+        :type column: int
+        :return: n/a
+        :rtype: n/a
+        """
+        self._executor.submit(self._compute_sort_keys, self._values, column, self._sort_key_function())
+
+    def _emit_results(self, generation, results):
+        """
+        Delivers background results to the GUI thread
+
+        :param generation: the generation the results belong to
+        :type generation: int
+        :param results: the results
+        :type results: tuple
+        :return: n/a
+        :rtype: n/a
+        """
+        try:
+            self._results_ready.emit(generation, results)
+        except RuntimeError:
+            # the proxy was deleted while we were working
+            pass
+
+    def _compute_matches(self, generation, values, candidates, needle, column, fold):
+        """
+        Background worker matching the index against the needle and collecting
+        the ancestors of every match
+
+        :param generation: the filter generation the results belong to
+        :type generation: int
+        :param values: the index - {path: display values}
+        :type values: dict
+        :param candidates: the paths to examine - None for every path
+        :type candidates: set
+        :param needle: the folded text to search for
+        :type needle: string
+        :param column: the column to search - -1 searches every column
+        :type column: int
+        :param fold: text normalisation function
+        :type fold: callable
+        :return: n/a
+        :rtype: n/a
+        """
+        # list() of a dict or set is atomic - the GUI thread may add entries meanwhile
+        if candidates is not None:
+            items = [(path, values[path]) for path in list(candidates) if path in values]
+        else:
+            items = list(values.items())
+
+        match = self._match
+        matches = set()
+        for i, (path, row_values) in enumerate(items):
+            if not i % 4096 and generation != self._generation:
+                # superseded - the user kept typing
+                return
+            if match(row_values, needle, column, fold):
+                matches.add(path)
+
+        accepted = set(matches)
+        for path in matches:
+            for i in range(len(path) - 1, 0, -1):
+                if path[:i] in accepted:
+                    break
+                accepted.add(path[:i])
+        self._emit_results(generation, ("filter", matches, accepted))
+
+    def _compute_sort_keys(self, values, column, sort_key):
+        """
+        Background worker computing the sort keys of a column
+
+        :param values: the index - {path: display values}
+        :type values: dict
+        :param column: the column to compute sort keys for
+        :type column: int
+        :param sort_key: sort key function
+        :type sort_key: callable
+        :return: n/a
+        :rtype: n/a
+        """
+        keys = {}
+        for path, row_values in list(values.items()):
+            if column < len(row_values):
+                keys[path] = sort_key(row_values[column])
+        self._emit_results(0, ("sort", values, column, keys))
 
-    Public Attributes:
-        :attr root: the root node of the variant hierarchy defined by this model
-        :type root: instance of <class 'Node'>
-    """
-    def __init__(self, root=None, parent=None):
+    def _apply_results(self, generation, results):
         """
-        Defines and initializes each instance object
+        Applies background results - if they are still current
 
-        :param parent: this widget's parent
-        :type parent: instance of <class 'QObject'>
+        :param generation: the filter generation the results belong to
+        :type generation: int
+        :param results: ("filter", matches, accepted) or ("sort", index, column, keys)
+        :type results: tuple
         :return: n/a
         :rtype: n/a
         """
-        super(TreeModel, self).__init__(parent)
-        self._root = Node("root")
+        if results[0] == "filter":
+            if generation == self._generation and self._needle:
+                self._matches, self._accepted = results[1:]
+                self.invalidateFilter()
+            return
+
+        _, values, column, keys = results
+        if values is not self._values:
+            # computed from a discarded index
+            return
+        self._sort_keys[column] = keys
+        pending = self._pending_sort
+        if pending is not None and pending[0] == column:
+            self._pending_sort = None
+            super(IndexedFilterProxyModel, self).sort(*pending)
+        elif column == self.sortColumn():
+            self.invalidate()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        """
+        Returns if the given source row is visible
+
+        :param source_row: the source row
+        :type source_row: int
+        :param source_parent: the source parent index
+        :type source_parent: instance of <class 'QModelIndex'>
+        :return: if the row is visible
+        :rtype: bool
+        """
+        if not self._needle:
+            return True
+        path = self._source_path(source_parent) + (source_row,)
+        if not self._stale and self._accepted is not None:
+            if path in self._accepted:
+                return True
+            if path in self._values:
+                return False
+
+        # not indexed yet - evaluate the row on its own
+        model = self.sourceModel()
+        row_values = self._row_values(model, source_row, self._column_count(model, source_parent), source_parent)
+        return self._row_matches(row_values)
 
     # --------------------------------------------------------------------------
-    # managed attributes
+    # sorting
     # --------------------------------------------------------------------------
-    @property
-    def root(self):
+    def _sort_key_function(self):
         """
-        Returns the root node of the variant hierarchy defined by this model
+        Returns the function converting display values into sort keys
 
-        :return: the root node of the variant hierarchy defined by this model
-        :rtype: instance of <class 'Node'>
+        :return: sort key function
+        :rtype: callable
         """
-        return self._root
+        if self.sort_key is not None:
+            return self.sort_key
+        fold = str
+        if self.sortCaseSensitivity() == QtCore.Qt.CaseInsensitive:
+            fold = lambda value: str(value).lower()
 
-    @root.setter
-    def root(self, value):
-        """
-        Returns the root node of the variant hierarchy defined by this model
+        def sort_key(value):
+            if value is None:
+                return (2, "")
+            if isinstance(value, (int, float)):
+                return (0, value)
+            return (1, fold(value))
+        return sort_key
 
-        :return: the root node of the variant hierarchy defined by this model
-        :rtype: instance of <class 'Node'>
+    def _make_sort_key(self, path, column):
         """
-        if not isinstance(value, Node):
-            msg = "Invalid root node. Expected {} - got {}".format(type(Node), type(value))
-            raise TypeError(msg)
-        self.__dict__["_root"] = value
+        Returns the sort key of the given source path and column
 
-    # --------------------------------------------------------------------------
-    # general
-    # --------------------------------------------------------------------------
-    def _get_node(self, index):
+        :param path: the source path
+        :type path: tuple
+        :param column: the column
+        :type column: int
+        :return: the sort key, or None if the row is not indexed
+        :rtype: any
         """
-        Returns the instance of <class 'Node'> associated with the given QModelIndex
+        keys = self._sort_keys.get(column)
+        if keys is not None and path in keys:
+            return keys[path]
+        row_values = self._values.get(path)
+        if row_values is None or column >= len(row_values):
+            return None
+        return self._sort_key_function()(row_values[column])
 
-        :param index: the QModelIndex to operate on
-        :type index: instance of <class 'QModelIndex'>
-        :return: the instance of <class 'Node'> associated with the given QModelIndex
-        :rtype: instance of <class 'Node'>
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
         """
-        if index and index.isValid():
-            return index.internalPointer()
-        return self._root
+        Sorts the proxy by the given column, once its sort keys are computed
 
-    # --------------------------------------------------------------------------
-    # super-class overrides
-    # --------------------------------------------------------------------------
-    def rowCount(self, index=QtCore.QModelIndex()):
+        :param column: the column to sort by - -1 restores the source order
+        :type column: int
+        :param order: the sort order
+        :type order: Qt.SortOrder constant
+        :return: n/a
+        :rtype: n/a
         """
-        Returns the number of children associated with the specified QModelIndex
+        if column < 0 or self._stale or column in self._sort_keys:
+            self._pending_sort = None
+            super(IndexedFilterProxyModel, self).sort(column, order)
+            return
+        self._pending_sort = (column, order)
+        self._request_sort_keys(column)
 
-        :param index: the QModel index to query
-        :type index: instance of <class 'QModelIndex'>
-        :return: number of children
-        :rtype: int
+    def lessThan(self, left, right):
         """
-        node = self._root
-        if index and index.isValid():
-            node = index.internalPointer()
-        return node.child_count
+        Compares two source indexes by their precomputed sort keys
 
-    def columnCount(self, index=QtCore.QModelIndex()):
+        :param left: the left source index
+        :type left: instance of <class 'QModelIndex'>
+        :param right: the right source index
+        :type right: instance of <class 'QModelIndex'>
+        :return: if `left` sorts before `right`
+        :rtype: bool
         """
-        Returns the number of objects associated with the children
-        of the specified QModelIndex
+        column = left.column()
+        left_key = self._make_sort_key(self._source_path(left), column)
+        right_key = self._make_sort_key(self._source_path(right), column)
+        if left_key is None or right_key is None:
+            return super(IndexedFilterProxyModel, self).lessThan(left, right)
+        return left_key < right_key
 
-        :param index: the QModel index to query
-        :type index: instance of <class 'QModelIndex'>
-        :return: number of data objects
-        :rtype: int
-        """
-        return 1
 
-    def flags(self, index):
+# ==============================================================================
+# asynchronous model population
+# ==============================================================================
+class _LoaderRunnable(QtCore.QRunnable):
+    """
+    QRunnable running a ModelLoader's producer on a QThreadPool
+    """
+    def __init__(self, loader):
         """
-        Defines various properties of the specified QModelIndex.
+        Defines and initializes each instance object
 
-        :param index: the QModel index to operate on
-        :type index: instance of <class 'QModelIndex'>
-        :return: aggregated ItemDataFlags
-        :rtype: QtCore.Qt.ItemDataFlags
+        :param loader: the loader to run
+        :type loader: instance of <class 'ModelLoader'>
+        :return: n/a
+        :rtype: n/a
         """
-        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable
+        super(_LoaderRunnable, self).__init__()
+        self.loader = loader
 
-    def data(self, index, role):
+    def run(self):
         """
-        Returns an appropriate value for the role that the view is requesting
+        Runs the loader's producer
 
-        :param index: the QModelIndex representing the view data to fetch
-        :type index: instance of <class 'QModelIndex'>
-        :param role: a role indicating the type of data the view is requesting
-        :type role: Qt.ItemDataRole constant
-        :return: a view role specific value
-        :rtype: various
+        :return: n/a
+        :rtype: n/a
         """
-        if not index.isValid() or index.column() > self.columnCount():
-            return None
+        self.loader._run()
 
-        # text
-        if role == QtCore.Qt.DisplayRole:
-            node = index.internalPointer()
-            return node.name
 
-        # font
-        if role == QtCore.Qt.FontRole:
-            return QtGui.QFont("Arial", 8, QtGui.QFont.Normal)
+class ModelLoader(QtCore.QObject):
+    """
+    Populates a model from a slow data source without blocking the GUI thread.
 
-        # color
-        if role == QtCore.Qt.ForegroundRole:
-            return QtGui.QColor(220, 220, 220)
+    `producer` is called on a worker thread - a QThreadPool, or a
+    concurrent.futures executor if one is given - and must return an iterable
+    of items. Items are buffered and sent to the GUI thread through a queued
+    signal every `batch_size` items or `interval` milliseconds, whichever
+    comes first. On the GUI thread, batches that arrive within `interval` ms
+    are coalesced and handed to `consumer` in a single call, so the model
+    emits one insertion signal per tick instead of one per item.
+    At most `max_pending` batches may wait for the GUI thread; the worker
+    blocks beyond that instead of flooding the event queue.
 
-        return None
+    Items are created on the worker thread and must not be Qt objects, nor
+    be touched by the model until the consumer receives them.
 
-    def setData(self, index, value, role=QtCore.Qt.EditRole):
-        """
-        Updates the internal data block and notifies this model's view that there
-        is new data to display
+    Usage:
+        loader = ModelLoader(lambda: read_records(path), model.extend)
+        loader.progress.connect(progress_bar.setValue)
+        loader.start()
 
-        :param index: The QModelIndex to operate on
-        :param index: instance of <class 'QtCore.QModelIndex'>
-        :param value: The value to set
-        :param value: instance of <class 'QtCore.QVariant'>
-        :param role: a role indicating the type of data the view is requesting
-        :type role: Qt.ItemDataRole constant
-        :return: success status of the operation
-        :rtype: bool
+    Public Attributes:
+        :attr progress: emitted with the number of items delivered so far and
+                        the expected total (-1 when unknown)
+        :type progress: instance of <class 'pyqtSignal'>
+        :attr finished: emitted once every item has been delivered
+        :type finished: instance of <class 'pyqtSignal'>
+        :attr failed: emitted with the exception raised by the producer
+        :type failed: instance of <class 'pyqtSignal'>
+        :attr cancelled: emitted once a cancelled load has stopped
+        :type cancelled: instance of <class 'pyqtSignal'>
+    """
+    progress = QtCore.pyqtSignal(int, int)
+    finished = QtCore.pyqtSignal()
+    failed = QtCore.pyqtSignal(object)
+    cancelled = QtCore.pyqtSignal()
+    _batch_ready = QtCore.pyqtSignal(object)
+    _worker_done = QtCore.pyqtSignal(object)
+
+    def __init__(self, producer, consumer, total=-1, batch_size=LOAD_BATCH_SIZE,
+                 interval=LOAD_INTERVAL, max_pending=LOAD_MAX_PENDING, executor=None, parent=None):
         """
-        # check if we should be editing
-        if role != QtCore.Qt.EditRole:
-            return False
+        Defines and initializes each instance object
 
-        # perform edit
-        node = index.internalPointer()
-        if value:
-            node.name = value
-            self.dataChanged.emit(index, index)
-            return True
+        :param producer: callable returning an iterable of items - run on a worker thread
+        :type producer: callable
+        :param consumer: callable receiving lists of items - run on the GUI thread
+        :type consumer: callable
+        :param total: the expected number of items, for progress reporting
+        :type total: int
+        :param batch_size: maximum number of items per batch
+        :type batch_size: int
+        :param interval: maximum age of a batch, and minimum time between
+                         consumer calls, in milliseconds
+        :type interval: int
+        :param max_pending: maximum number of batches waiting for the GUI thread
+        :type max_pending: int
+        :param executor: executor to run the producer on - defaults to the global QThreadPool
+        :type executor: instance of <class 'concurrent.futures.Executor'>
+        :param parent: this object's parent
+        :type parent: instance of <class 'QObject'>
+        :return: n/a
+        :rtype: n/a
+        """
+        super(ModelLoader, self).__init__(parent)
+        self.producer = producer
+        self.consumer = consumer
+        self.total = total
+        self.batch_size = batch_size
+        self.interval = interval
+        self.executor = executor
+
+        self._cancel = threading.Event()
+        self._slots = threading.Semaphore(max_pending)
+        self._queue = []
+        self._loaded = 0
+        self._running = False
+        self._done = False
+        self._error = None
+        self._runnable = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._deliver)
+        self._batch_ready.connect(self._on_batch_ready)
+        self._worker_done.connect(self._on_worker_done)
 
-        return False
+    # --------------------------------------------------------------------------
+    # managed attributes
+    # --------------------------------------------------------------------------
+    @property
+    def is_running(self):
+        """
+        Returns if this loader is still producing or delivering items
 
-    def headerData(self, section, orientation, role):
+        :return: if this loader is running
+        :rtype: bool
         """
-        Returns an appropriate value for the role that the header view is requesting
+        return self._running
 
-        :param section: the row or column number being requested
-        :type section: int
-        :param orientation: the header view orientation - (Qt.Horizontal, Qt.Vertical
-        :type orientation: Qt.Orientation constant
-        :param role: a role indicating the type of data the view is requesting
-        :type role: Qt.ItemDataRole constant
-        :return: a view role specific value
-        :rtype: various
+    @property
+    def loaded(self):
         """
-        if orientation == QtCore.Qt.Vertical or section != 0:
-            return None
+        Returns the number of items delivered to the consumer so far
 
-        # text
-        if role == QtCore.Qt.DisplayRole:
-            text = "Column{}".format(section)
-            if orientation == QtCore.Qt.Vertical:
-                text = "Row{}".format(section)
-            return text
+        :return: the number of items delivered
+        :rtype: int
+        """
+        return self._loaded
 
-        # font
-        if role == QtCore.Qt.FontRole:
-            return QtGui.QFont("Arial", 8, QtGui.QFont.Bold)
+    # --------------------------------------------------------------------------
+    # control
+    # --------------------------------------------------------------------------
+    def start(self):
+        """
+        Starts producing items on a worker thread
+
+        :return: this loader
+        :rtype: instance of <class 'ModelLoader'>
+        """
+        if self._running:
+            raise RuntimeError("Loader is already running")
+        self._cancel.clear()
+        self._queue = []
+        self._loaded = 0
+        self._done = False
+        self._error = None
+        self._running = True
+        if self.executor is not None:
+            self.executor.submit(self._run)
+        else:
+            self._runnable = _LoaderRunnable(self)
+            QtCore.QThreadPool.globalInstance().start(self._runnable)
+        return self
 
-        # color
-        if role == QtCore.Qt.ForegroundRole:
-            return QtGui.QColor(220, 220, 220)
+    def cancel(self):
+        """
+        Stops the load. Batches not yet delivered are dropped and `cancelled`
+        is emitted once the worker has stopped
 
-        return None
+        :return: n/a
+        :rtype: n/a
+        """
+        if not self._running:
+            return
+        self._cancel.set()
+        self._timer.stop()
+        for _ in self._queue:
+            self._slots.release()
+        self._queue = []
+        self._finish()
 
-    def parent(self, index):
+    # --------------------------------------------------------------------------
+    # worker thread
+    # --------------------------------------------------------------------------
+    def _send(self, batch):
         """
-        Returns the parent of the specified QModelIndex
+        Sends a batch to the GUI thread, waiting while too many are pending
 
-        :param index: the QModelIndex to operate on
-        :type index: instance of <class 'QModelIndex'>
-        :return: the parent of the specified QModelIndex
-        :rtype: instance of <class 'QModelIndex'>
+        :param batch: the items to send
+        :type batch: list
+        :return: if the batch was sent - False once cancelled
+        :rtype: bool
         """
-        node = self._get_node(index)
-        parent_node = node.parent
-        if parent_node == self._root:
-            return self.createIndex(-1, -1, parent_node)
-        return self.createIndex(index.row(), 0, parent_node)
+        while not self._slots.acquire(timeout=0.1):
+            if self._cancel.is_set():
+                return False
+        if self._cancel.is_set():
+            self._slots.release()
+            return False
+        self._batch_ready.emit(batch)
+        return True
 
-    def createIndex(self, row, column, object_):
+    def _run(self):
         """
-        Creates a QModelIndex object for the specified row and column
-        that is associated with the given object
+        Iterates the producer, sending batches by size or age
 
-        :param row: the row number
-        :type row: int
-        :param column: the column number
-        :type column:  int
-        :param object_: the object the QModelIndex is associalted with
-        :type object_: any
-        :return:
-        :rtype: instance of <class 'QModelIndex'>
+        :return: n/a
+        :rtype: n/a
         """
-        return super(TreeModel, self).createIndex(row, column, object_)
+        error = None
+        try:
+            interval = self.interval / 1000.0
+            batch = []
+            flushed = time.monotonic()
+            for item in self.producer():
+                if self._cancel.is_set():
+                    break
+                batch.append(item)
+                now = time.monotonic()
+                if len(batch) >= self.batch_size or now - flushed >= interval:
+                    if not self._send(batch):
+                        break
+                    batch = []
+                    flushed = now
+            if batch and not self._cancel.is_set():
+                self._send(batch)
+        except Exception as error_:
+            error = error_
+        try:
+            self._worker_done.emit(error)
+        except RuntimeError:
+            # the loader was deleted while we were working
+            pass
 
-    def index(self, row, column, parent=QtCore.QModelIndex()):
+    # --------------------------------------------------------------------------
+    # GUI thread
+    # --------------------------------------------------------------------------
+    def _on_batch_ready(self, batch):
         """
-        Returns a QModelIndex for the given row and column, with the specified parent
+        Queues a batch, delivering it at the next tick
 
-        :param row: the child index's row number relative to the specified parent index
-        :type row: int
-        :param column: the child index's column number relative to the specified parent index
-        :type column: int
-        :param parent: QModelIndex whose child index you wish to fetch
-        :type parent: instance of <class 'QModelIndex'>
-        :return: child index
-        :rtype: instance of <class 'QModelIndex'>
+        :param batch: the items received
+        :type batch: list
+        :return: n/a
+        :rtype: n/a
         """
-        # get Node object
-        parent_node = self._get_node(parent)
-        child_node = parent_node.child(row)
+        if self._cancel.is_set():
+            self._slots.release()
+            return
+        self._queue.append(batch)
+        if not self._timer.isActive():
+            self._timer.start()
 
-        # create QModelIndex
-        index = self.createIndex(-1, -1, self._root)
-        if child_node:
-            index = self.createIndex(row, column, child_node)
-        return index
+    def _deliver(self):
+        """
+        Hands every queued batch to the consumer in a single call
 
-    def insertRows(self, row, count=1, parent=QtCore.QModelIndex()):
-        # get parent node
-        parent_node = self._root
-        if parent and parent.isValid():
-            parent_node = parent.internalPointer()
+        :return: n/a
+        :rtype: n/a
+        """
+        queue, self._queue = self._queue, []
+        if not queue:
+            self._finish()
+            return
+        items = queue[0] if len(queue) == 1 else list(itertools.chain.from_iterable(queue))
+        for _ in queue:
+            self._slots.release()
+        try:
+            self.consumer(items)
+        except Exception as error:
+            self._error = error
+            self.cancel()
+            return
+        self._loaded += len(items)
+        self.progress.emit(self._loaded, self.total)
+        self._finish()
 
-        # update QModelIndex hierarchy
-        self.beginInsertRows(parent, row, row + count)
-        for i in range(count):
-            name = "child{}".format(i)
-            child_node = Node(name, parent=parent_node)
-            self.createIndex(row, 0, child_node)
-            row += i
-        self.endInsertRows()
+    def _on_worker_done(self, error):
+        """
+        Records the worker's outcome and finishes once every batch is delivered
 
-        return True
+        :param error: the exception raised by the producer, if any
+        :type error: Exception or None
+        :return: n/a
+        :rtype: n/a
+        """
+        self._done = True
+        if self._error is None:
+            self._error = error
+        if not self._timer.isActive():
+            self._deliver()
 
-    def removeRows(self, row, count=1, parent=QtCore.QModelIndex()):
-        # update QModelIndex hierarchy
-        self.beginRemoveRows(parent, row, row + count)
-        for i in range(row, row + count):
-            child_node = parent.child(i, 0).internalPointer()
-            child_node.parent = None
-        self.endRemoveRows()
+    def _finish(self):
+        """
+        Emits the final signal once the worker stopped and the queue is empty
 
-        return True
+        :return: n/a
+        :rtype: n/a
+        """
+        if not self._done or self._queue or not self._running:
+            return
+        self._running = False
+        self._runnable = None
+        if self._error is not None:
+            self.failed.emit(self._error)
+        elif self._cancel.is_set():
+            self.cancelled.emit()
+        else:
+            self.finished.emit()
 
 
 # ==============================================================================
@@ -977,10 +3797,73 @@ class TreeItem(QtWidgets.QTreeWidgetItem):
         :rtype children: list
         :attr relatives(descendants): method that returns a list of this object's descendants or ancestors in root to leaf order
         :rtype relatives: list
+        :attr iter_ancestors(predicate): lazily yields this object's ancestors in leaf to root order
+        :rtype iter_ancestors: generator
+        :attr iter_descendants(max_depth, predicate, prune): lazily yields this object's descendants in root to leaf order
+        :rtype iter_descendants: generator
+        :attr iter_children(): lazily yields this object's immediate children
+        :rtype iter_children: generator
     """
     def __init__(self, *args, **kwargs):
         super(TreeItem, self).__init__(*args, **kwargs)
 
+    # --------------------------------------------------------------------------
+    # traversal
+    # --------------------------------------------------------------------------
+    def iter_ancestors(self, predicate=None):
+        """
+        Yields this object's ancestors, nearest first, without recursion
+
+        :param predicate: optional callable - only ancestors it returns True for are yielded
+        :type predicate: callable
+        :return: this object's ancestors in leaf to root order
+        :rtype: generator
+        """
+        parent = self.parent()
+        while parent is not None:
+            if predicate is None or predicate(parent):
+                yield parent
+            parent = parent.parent()
+
+    def iter_children(self):
+        """
+        Yields this object's immediate children
+
+        :return: this object's children
+        :rtype: generator
+        """
+        for i in range(self.childCount()):
+            yield self.child(i)
+
+    def iter_descendants(self, max_depth=None, predicate=None, prune=None):
+        """
+        Yields this object's descendants depth first in root to leaf order,
+        without recursion - so arbitrarily deep trees are safe and callers can
+        stop early without visiting the rest of the tree
+
+        :param max_depth: deepest level to visit - 1 only visits children
+        :type max_depth: int
+        :param predicate: optional callable - only descendants it returns True for are yielded
+        :type predicate: callable
+        :param prune: optional callable - descendants it returns True for are
+                      skipped along with their own descendants
+        :type prune: callable
+        :return: this object's descendants
+        :rtype: generator
+        """
+        if max_depth is not None and max_depth < 1:
+            return
+        stack = [(self.child(i), 1) for i in range(self.childCount() - 1, -1, -1)]
+        while stack:
+            item, depth = stack.pop()
+            if prune is not None and prune(item):
+                continue
+            if predicate is None or predicate(item):
+                yield item
+            if max_depth is None or depth < max_depth:
+                depth += 1
+                stack.extend((item.child(i), depth) for i in range(item.childCount() - 1, -1, -1))
+
     # --------------------------------------------------------------------------
     # ancestors
     # --------------------------------------------------------------------------
@@ -993,12 +3876,15 @@ class TreeItem(QtWidgets.QTreeWidgetItem):
         :return: n/a
         :rtype: n/a
         """
+        if isinstance(accumulator, list):
+            ancestors = list(self.iter_ancestors())
+            ancestors.reverse()
+            accumulator[:0] = ancestors
+            return
+
         parent = self.parent()
         if parent:
-            if isinstance(accumulator, list):
-                accumulator.insert(0, parent)
-                parent.get_ancestors(accumulator)
-            elif isinstance(accumulator, dict):
+            if isinstance(accumulator, dict):
                 new_accumulator = {self: accumulator}
                 parent.get_ancestors(new_accumulator)
 
@@ -1010,8 +3896,8 @@ class TreeItem(QtWidgets.QTreeWidgetItem):
         :return: list of this object's ancestors in root to leaf order
         :rtype: list
         """
-        accumulator = list()
-        self.get_ancestors(accumulator)
+        accumulator = list(self.iter_ancestors())
+        accumulator.reverse()
         return accumulator
 
     # --------------------------------------------------------------------------
@@ -1026,13 +3912,14 @@ class TreeItem(QtWidgets.QTreeWidgetItem):
         :return: n/a
         :rtype: n/a
         """
+        if isinstance(accumulator, list):
+            accumulator.extend(self.iter_descendants())
+            return
+
         count = self.childCount()
         for i in range(count):
             child = self.child(i)
-            if isinstance(accumulator, list):
-                accumulator.append(child)
-                child.get_descendants(accumulator)
-            elif isinstance(accumulator, dict):
+            if isinstance(accumulator, dict):
                 accumulator[child] = dict()
                 if not child.childCount():
                     accumulator[child] = list()
@@ -1046,9 +3933,7 @@ class TreeItem(QtWidgets.QTreeWidgetItem):
         :return: list of this object's descendants in root to leaf order
         :rtype: list
         """
-        accumulator = list()
-        self.get_descendants(accumulator)
-        return accumulator
+        return list(self.iter_descendants())
 
     @property
     def children(self):
@@ -1058,11 +3943,7 @@ class TreeItem(QtWidgets.QTreeWidgetItem):
         :return: list of this object's immediate children
         :rtype: list
         """
-        children = list()
-        count = self.childCount()
-        for i in range(count):
-            children.append(self.child(i))
-        return children
+        return list(self.iter_children())
 
     # --------------------------------------------------------------------------
     # relatives
@@ -1092,6 +3973,70 @@ class TreeItem(QtWidgets.QTreeWidgetItem):
         return relatives
 
 
+def populate_tree_widget(parent, nodes, columns=None, item_class=TreeItem, node_role=None):
+    """
+    Builds tree widget items for the given Node trees in bulk.
+    Items are created detached and attached to their parents with
+    addChildren, then added to `parent` in one call while the widget's
+    updates and sorting are disabled - instead of one widget insertion,
+    sort and relayout per item
+
+    :param parent: the tree widget - or tree widget item - to add items to
+    :type parent: instance of <class 'QTreeWidget'> or <class 'QTreeWidgetItem'>
+    :param nodes: the Node trees to add
+    :type nodes: iterable of <class 'Node'>
+    :param columns: column specifications, as accepted by TreeModel - defaults to the node names
+    :type columns: list
+    :param item_class: the tree widget item class to instantiate
+    :type item_class: subclass of <class 'QTreeWidgetItem'>
+    :param node_role: data role of column 0 to store each item's node under, e.g.
+                      Qt.UserRole - skipped by default as it adds to the build time
+    :type node_role: Qt.ItemDataRole constant
+    :return: the items created for the given nodes
+    :rtype: list
+    """
+    columns = [TreeColumn.from_spec(each) for each in (columns or ["name"])]
+    displays = [column.display for column in columns]
+
+    def make_item(node):
+        item = item_class([str(display(node)) for display in displays])
+        if node_role is not None:
+            item.setData(0, node_role, node)
+        return item
+
+    # build the detached hierarchy iteratively
+    nodes = list(nodes)
+    tops = [make_item(node) for node in nodes]
+    stack = list(zip(tops, nodes))
+    while stack:
+        item, node = stack.pop()
+        children = node.children
+        if not children:
+            continue
+        child_items = [make_item(child) for child in children]
+        item.addChildren(child_items)
+        stack.extend(zip(child_items, children))
+
+    # attach everything at once
+    widget = parent if isinstance(parent, QtWidgets.QTreeWidget) else parent.treeWidget()
+    updates = sorting = None
+    if widget is not None:
+        updates = widget.updatesEnabled()
+        sorting = widget.isSortingEnabled()
+        widget.setUpdatesEnabled(False)
+        widget.setSortingEnabled(False)
+    try:
+        if isinstance(parent, QtWidgets.QTreeWidget):
+            parent.addTopLevelItems(tops)
+        else:
+            parent.addChildren(tops)
+    finally:
+        if widget is not None:
+            widget.setSortingEnabled(sorting)
+            widget.setUpdatesEnabled(updates)
+    return tops
+
+
 class QCollapsableLabel(QtWidgets.QLabel):
     """
     QLabel object that can be toggled between collapsed and expanded states.